@@ -0,0 +1,226 @@
+"""
+Scalability benchmarks for generate_data.py and the paper figures
+
+Generates a synthetic data/ for each scale point (see synthetic.py), then
+builds it in fresh processes: cold builds (no cache), one --incremental
+rebuild with nothing changed and, with --figures, a fig2 render from the
+result. Each point records wall time, peak RSS and input/output sizes.
+
+    python benchmarks/bench_build.py                                  # default scale points
+    python benchmarks/bench_build.py --point agents=2000,models=8,runs=5 --repeat 5
+    python benchmarks/bench_build.py --compare benchmarks/results/abc1234.json
+
+Results go to benchmarks/results/<label>.json (default label: the git
+revision) so the numbers can be compared across versions.
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from synthetic import Scale, format_time, generate_dataset
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+REPO_ROOT = SCRIPT_DIR.parent
+RESULTS_DIR = SCRIPT_DIR / "results"
+
+SCALE_POINTS = {
+    "current": Scale(agents=25, models=4, benchmarks=7, runs=3),
+    "agents-200": Scale(agents=200, runs=5),
+    "agents-1000": Scale(agents=1000, runs=5),
+    "wide": Scale(agents=200, models=16, benchmarks=24, runs=5),
+    "runs-500": Scale(agents=20, runs=500, run_agents=10),
+}
+
+
+def run_child(mode: str, root: Path) -> dict:
+    # Every measurement gets its own interpreter, so peak RSS is per build
+    result = subprocess.run(
+        [sys.executable, str(Path(__file__).resolve()), "--child", mode, str(root)],
+        capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"{mode} build in {root} failed:\n{result.stdout}{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def child(mode: str, root: Path) -> None:
+    sys.path.insert(0, str(REPO_ROOT))
+    import generate_data
+    import parsed_cache
+
+    names = json.loads((root / "dataset.json").read_text())
+    generate_data.BASE_MODELS = names["base_models"]
+    generate_data.HUMAN_MODELS = names["human_models"]
+    generate_data.BENCHMARKS = names["benchmarks"]
+    # Keep parsed CSVs with the synthetic tree, so cold builds parse them again
+    parsed_cache.CACHE_DIR = root / generate_data.CACHE_DIR / "parsed"
+    os.chdir(root)
+
+    start = time.perf_counter()
+    if mode == "figure":
+        render_figure(root)
+    else:
+        generate_data.generate_scores_json(incremental=mode == "incremental")
+    elapsed = time.perf_counter() - start
+    print(json.dumps({"seconds": elapsed, "peakRssKiB": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}))
+
+
+def render_figure(root: Path) -> None:
+    # fig2 from the synthetic build: every agent with time data, placed
+    # without the label layout cache so placement is measured too
+    sys.path.insert(0, str(REPO_ROOT / "paper-plots"))
+    import pandas as pd
+    from build_figures import load_figure_module
+
+    scores = json.loads((root / "scores.json").read_text())
+    rows = [
+        {
+            "Agent": agent_key,
+            "AvgTime": format_time(entry["hours"] * 3600),
+            "StdTime": format_time((entry["stdHours"] or 0) * 3600),
+            "AvgPerf": scores["aggregatedScores"][agent_key]["avg"],
+            "StdPerf": scores["aggregatedScores"][agent_key]["std"],
+        }
+        for agent_key, entry in scores["timeData"].items()
+        if agent_key in scores["aggregatedScores"]
+    ]
+    csv_path = root / "fig2.csv"
+    pd.DataFrame(rows).to_csv(csv_path, index=False)
+
+    module = load_figure_module(REPO_ROOT / "paper-plots" / "fig2_time_vs_performance.py")
+    module.LABEL_CACHE_DIR = None
+    with open(os.devnull, "w") as devnull:
+        stdout, sys.stdout = sys.stdout, devnull
+        try:
+            module.create_figure(module.load_data(csv_path), root / "fig2", background="white", formats=("png",))
+        finally:
+            sys.stdout = stdout
+
+
+def directory_size(path: Path) -> tuple[int, int]:
+    files = [f for f in path.rglob("*") if f.is_file()]
+    return len(files), sum(f.stat().st_size for f in files)
+
+
+def measure(name: str, scale: Scale, repeat: int, figures: bool) -> dict:
+    with tempfile.TemporaryDirectory(prefix="bench-build-") as tmp:
+        root = Path(tmp)
+        start = time.perf_counter()
+        generate_dataset(root, scale)
+        generate_seconds = time.perf_counter() - start
+        input_files, input_bytes = directory_size(root / "data")
+
+        cold = []
+        for _ in range(repeat):
+            shutil.rmtree(root / ".cache", ignore_errors=True)
+            (root / "scores.json").unlink(missing_ok=True)
+            cold.append(run_child("full", root))
+        run_child("incremental", root)  # primes .cache
+        warm = run_child("incremental", root)
+
+        point = {
+            "name": name,
+            "scale": str(scale),
+            "inputFiles": input_files,
+            "inputBytes": input_bytes,
+            "generateSeconds": round(generate_seconds, 4),
+            "buildSeconds": [round(run["seconds"], 4) for run in cold],
+            "buildMedianSeconds": round(statistics.median(run["seconds"] for run in cold), 4),
+            "buildPeakRssKiB": max(run["peakRssKiB"] for run in cold),
+            "incrementalSeconds": round(warm["seconds"], 4),
+            "outputBytes": (root / "scores.json").stat().st_size,
+        }
+        if figures:
+            figure = run_child("figure", root)
+            point["figureSeconds"] = round(figure["seconds"], 4)
+            point["figurePeakRssKiB"] = figure["peakRssKiB"]
+        return point
+
+
+def git_revision() -> str:
+    try:
+        rev = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                             capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=REPO_ROOT,
+                               capture_output=True, text=True, check=True).stdout.strip()
+        return f"{rev}-dirty" if dirty else rev
+    except (OSError, subprocess.CalledProcessError):
+        return "local"
+
+
+def print_point(point: dict, width: int, baseline: dict | None = None) -> None:
+    line = (f"{point['name']:{width}s}{point['inputFiles']:>8d}{point['buildMedianSeconds']:>10.3f}"
+            f"{point['incrementalSeconds']:>10.3f}{point['buildPeakRssKiB'] / 1024:>10.1f}"
+            f"{point['outputBytes'] / 2**20:>10.2f}")
+    if "figureSeconds" in point:
+        line += f"{point['figureSeconds']:>9.3f}"
+    if baseline is not None:
+        line += f"   {point['buildMedianSeconds'] / baseline['buildMedianSeconds']:5.2f}x time"
+        line += f"  {point['buildPeakRssKiB'] / baseline['buildPeakRssKiB']:5.2f}x rss"
+    print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark generate_data.py on synthetic datasets")
+    parser.add_argument("points", nargs="*", help=f"named scale points (default: all of {', '.join(SCALE_POINTS)})")
+    parser.add_argument("--point", action="append", default=[], metavar="SPEC",
+                        help="extra scale point, e.g. agents=500,models=8,benchmarks=12,runs=5,run_agents=0")
+    parser.add_argument("--repeat", type=int, default=3, help="cold builds per point (default: 3)")
+    parser.add_argument("--figures", action="store_true", help="also time a fig2 render per point")
+    parser.add_argument("--label", default=None, help="results file name (default: git revision)")
+    parser.add_argument("--compare", type=Path, help="earlier results file to compare against")
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "ROOT"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child[0], Path(args.child[1]))
+        return 0
+
+    unknown = [name for name in args.points if name not in SCALE_POINTS]
+    if unknown:
+        print(f"Unknown scale point(s): {', '.join(unknown)}")
+        return 1
+    points = {name: SCALE_POINTS[name] for name in args.points or ([] if args.point else SCALE_POINTS)}
+    points.update({spec: Scale.parse(spec) for spec in args.point})
+
+    baseline = {}
+    if args.compare:
+        baseline = {point["scale"]: point for point in json.loads(args.compare.read_text())["points"]}
+
+    width = max(len(name) for name in ["point", *points]) + 2
+    header = f"{'point':{width}s}{'files':>8s}{'build s':>10s}{'incr s':>10s}{'rss MiB':>10s}{'out MiB':>10s}"
+    print(header + (f"{'fig2 s':>9s}" if args.figures else ""))
+    results = []
+    for name, scale in points.items():
+        point = measure(name, scale, args.repeat, args.figures)
+        print_point(point, width, baseline.get(point["scale"]))
+        results.append(point)
+
+    label = args.label or git_revision()
+    report = {
+        "label": label,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "processor": platform.processor() or platform.machine(),
+        "cpus": os.cpu_count(),
+        "points": results,
+    }
+    RESULTS_DIR.mkdir(exist_ok=True)
+    report_file = RESULTS_DIR / f"{label}.json"
+    report_file.write_text(json.dumps(report, indent=2))
+    print(f"\nWrote {report_file}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
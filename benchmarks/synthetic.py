@@ -0,0 +1,140 @@
+"""
+Synthetic datasets in the layout of data/
+
+Writes everything generate_data.py reads, at any size: factors.json, the
+baseline files, aggregated_avg_*/aggregated_std_* pairs with matching
+single_metrics_aggregated.csv and time_aggregated.csv rows, opencode
+aggregated_*/final_* pairs with "ERR" and "not stored" cells and
+aggregated_time_overview.csv rows, and optionally data/runs/ directories.
+
+Native agents' averages and stds are computed from `runs` simulated runs, so
+the files are consistent with each other the way real results are.
+"""
+
+import csv
+import json
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import numpy as np
+
+NOT_STORED_RATE = 0.05
+ERROR_RATE = 0.02
+
+
+@dataclass
+class Scale:
+    agents: int = 25
+    models: int = 4
+    benchmarks: int = 7
+    runs: int = 3
+    run_agents: int = 0  # agents shipped as data/runs/<label>/ instead of aggregated files
+    seed: int = 0
+
+    @classmethod
+    def parse(cls, spec: str) -> "Scale":
+        # "agents=500,models=8,benchmarks=12,runs=5"
+        fields = {}
+        for item in filter(None, spec.split(",")):
+            key, _, value = item.partition("=")
+            if key not in cls.__dataclass_fields__:
+                raise ValueError(f"unknown scale field {key!r} in {spec!r}")
+            fields[key] = int(value)
+        return cls(**fields)
+
+    def __str__(self) -> str:
+        return ",".join(f"{key}={value}" for key, value in asdict(self).items())
+
+
+def format_time(seconds: float) -> str:
+    seconds = int(round(seconds))
+    return f"{seconds // 3600}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
+def write_matrix(filepath: Path, models: list, benchmarks: list, rows) -> None:
+    with open(filepath, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["model"] + benchmarks)
+        for model, row in zip(models, rows):
+            writer.writerow([model] + [value if isinstance(value, str) else repr(float(value)) for value in row])
+
+
+def write_rows(filepath: Path, header: list, rows: list) -> None:
+    with open(filepath, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def generate_dataset(root: Path, scale: Scale) -> dict:
+    """Write root/data/ for `scale` and return the names generate_data.py needs."""
+    rng = np.random.default_rng(scale.seed)
+    data_dir = root / "data"
+    data_dir.mkdir(parents=True, exist_ok=True)
+
+    base_models = [f"Base-{m + 1:02d}" for m in range(scale.models)]
+    human_models = [f"Base-{m + 1:02d}-it" for m in range(scale.models)]
+    benchmarks = [f"bench{b + 1:02d}" for b in range(scale.benchmarks)]
+    shape = (scale.models, scale.benchmarks)
+
+    weights = rng.dirichlet(np.ones(scale.benchmarks))
+    with open(data_dir / "factors.json", "w") as f:
+        json.dump(dict(zip(benchmarks, weights.tolist())), f, indent=4)
+
+    base = rng.uniform(0.0, 0.3, shape)
+    write_matrix(data_dir / "aggregated_baseline.csv", human_models + base_models, benchmarks,
+                 np.vstack([np.clip(base + rng.uniform(0.2, 0.5, shape), 0, 1), base]))
+    write_matrix(data_dir / "aggregated_baseline_fewshot.csv", base_models, benchmarks,
+                 np.clip(base + rng.uniform(0.0, 0.1, shape), 0, 1))
+
+    native = (scale.agents - scale.run_agents + 1) // 2
+    opencode = scale.agents - scale.run_agents - native
+    single_metrics, times, overview = [], [], []
+
+    for i in range(native):
+        label = f"Agent-{i + 1:04d}"
+        skill = rng.uniform(0.0, 0.4)
+        runs = np.clip(base + skill * rng.uniform(0.5, 1.5, shape) + rng.normal(0, 0.03, (scale.runs,) + shape), 0, 1)
+        run_scores = (runs @ weights).mean(axis=1)
+        run_hours = rng.uniform(1, 10) + rng.normal(0, 0.5, scale.runs)
+        ddof = 1 if scale.runs > 1 else 0
+        write_matrix(data_dir / f"aggregated_avg_{label}.csv", base_models, benchmarks, runs.mean(axis=0))
+        write_matrix(data_dir / f"aggregated_std_{label}.csv", base_models, benchmarks, runs.std(axis=0, ddof=ddof))
+        single_metrics.append([label, run_scores.mean(), run_scores.std(ddof=ddof), scale.runs])
+        times.append([label, format_time(run_hours.mean() * 3600), format_time(run_hours.std(ddof=ddof) * 3600),
+                      scale.runs])
+
+    for i in range(opencode):
+        run = f"opencode_opencode_model-{i + 1:04d}_10h"
+        final = np.clip(base + rng.uniform(0.0, 0.3) * rng.uniform(0.5, 1.5, shape), 0, 1)
+        cells = final.astype(object)
+        roll = rng.uniform(size=shape)
+        missing = roll < NOT_STORED_RATE + ERROR_RATE
+        cells[roll < NOT_STORED_RATE] = "not stored"
+        cells[(roll >= NOT_STORED_RATE) & missing] = "ERR"
+        # final_* fills missing cells with the base model's own score
+        final[missing] = base[missing]
+        write_matrix(data_dir / f"aggregated_{run}.csv", base_models, benchmarks, cells)
+        write_matrix(data_dir / f"final_{run}.csv", base_models, benchmarks, final)
+        hours = rng.uniform(0.5, 10)
+        overview.append([run, format_time(hours * 3600), f"{hours * 10:.1f}%"])
+
+    for i in range(scale.run_agents):
+        run_dir = data_dir / "runs" / f"Runs-{i + 1:04d}"
+        run_dir.mkdir(parents=True, exist_ok=True)
+        skill = rng.uniform(0.0, 0.4)
+        hours = rng.uniform(1, 10)
+        for r in range(scale.runs):
+            run = np.clip(base + skill + rng.normal(0, 0.03, shape), 0, 1)
+            write_matrix(run_dir / f"run{r + 1:04d}.csv", base_models, benchmarks, run)
+        write_rows(run_dir / "time.csv", ["run", "time"],
+                   [[f"run{r + 1:04d}", format_time((hours + rng.normal(0, 0.5)) * 3600)] for r in range(scale.runs)])
+
+    write_rows(data_dir / "single_metrics_aggregated.csv", ["agent", "avg", "std", "n"], single_metrics)
+    write_rows(data_dir / "time_aggregated.csv", ["agent", "avg_time", "std_time", "n"], times)
+    write_rows(data_dir / "aggregated_time_overview.csv", ["method", "average_time", "percentage"], overview)
+
+    names = {"base_models": base_models, "human_models": human_models, "benchmarks": benchmarks}
+    with open(root / "dataset.json", "w") as f:
+        json.dump({"scale": asdict(scale), **names}, f, indent=2)
+    return names
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Build a deployable copy of the site with fingerprinted assets
+
+Copies the site into dist/ with each asset renamed to include its content hash
+(scores.<hash>.json, script.<hash>.js, ...) and every reference to it
+rewritten, so the assets can be cached forever and a new build is picked up
+through index.html alone. Next to each file go .gz and .br copies at maximum
+compression, produced in parallel.
+
+Assets are processed in dependency order: data.js names scores.json, so its
+reference is rewritten before data.js is hashed, and a new scores.json gives
+data.js a new name too. Hashed files never change, so an asset whose hash is
+already in dist/ is neither copied nor compressed again.
+
+    python3 generate_data.py && python3 build_site.py
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+ROOT_DIR = Path(__file__).resolve().parent
+SITE_DIR = ROOT_DIR / "dist"
+MANIFEST_NAME = "asset-manifest.json"
+
+# Referenced files, in dependency order
+ASSETS = ["scores.json", "config.js", "data.js", "script.js", "styles.css",
+          "favicon.svg", "pipeline.svg", "pipeline-mobile.svg"]
+# Entry points keep their names and are rewritten on every build
+PAGES = ["index.html"]
+STATIC = ["CNAME"]
+
+HASH_LENGTH = 10
+COMPRESSED_SUFFIXES = (".gz", ".br")
+
+
+def hashed_name(name, content):
+    stem, _, suffix = name.rpartition(".")
+    return f"{stem}.{hashlib.sha256(content).hexdigest()[:HASH_LENGTH]}.{suffix}"
+
+
+def rewrite_references(content, names):
+    # Only whole quoted names: "scores.json" or 'data.js', as in src=, href=, data= and fetch()
+    for name, hashed in names.items():
+        pattern = re.compile(rb"""(?<=["'])""" + re.escape(name.encode()) + rb"""(?=["'])""")
+        content = pattern.sub(hashed.encode(), content)
+    return content
+
+
+def write_if_changed(filepath, content):
+    if filepath.exists() and filepath.read_bytes() == content:
+        return False
+    filepath.write_bytes(content)
+    return True
+
+
+def compress(filepath):
+    content = filepath.read_bytes()
+    outputs = [filepath.name + ".gz"]
+    (filepath.parent / outputs[0]).write_bytes(gzip.compress(content, compresslevel=9, mtime=0))
+    if brotli is None:
+        return outputs
+    outputs.append(filepath.name + ".br")
+    (filepath.parent / outputs[1]).write_bytes(brotli.compress(content, quality=11))
+    return outputs
+
+
+def needs_compression(filepath):
+    # A sibling older than its file was left by an earlier build of the same name (index.html)
+    mtime = filepath.stat().st_mtime_ns
+    for suffix in COMPRESSED_SUFFIXES:
+        sibling = filepath.with_name(filepath.name + suffix)
+        if suffix == ".br" and brotli is None:
+            continue
+        if not sibling.exists() or sibling.stat().st_mtime_ns < mtime:
+            return True
+    return False
+
+
+def build_site(site_dir=SITE_DIR, jobs=1):
+    site_dir.mkdir(parents=True, exist_ok=True)
+    names = {}
+    written = []
+    for name in ASSETS:
+        content = rewrite_references((ROOT_DIR / name).read_bytes(), names)
+        names[name] = hashed_name(name, content)
+        target = site_dir / names[name]
+        if not target.exists():
+            target.write_bytes(content)
+            written.append(names[name])
+
+    outputs = set(names.values())
+    for name in PAGES:
+        if write_if_changed(site_dir / name, rewrite_references((ROOT_DIR / name).read_bytes(), names)):
+            written.append(name)
+        outputs.add(name)
+    for name in STATIC:
+        if (ROOT_DIR / name).exists():
+            if write_if_changed(site_dir / name, (ROOT_DIR / name).read_bytes()):
+                written.append(name)
+            outputs.add(name)
+
+    write_if_changed(site_dir / MANIFEST_NAME, json.dumps(names, indent=2).encode())
+    outputs.add(MANIFEST_NAME)
+
+    pending = [site_dir / name for name in sorted(outputs) if name != "CNAME" and needs_compression(site_dir / name)]
+    compressed = []
+    with ProcessPoolExecutor(max_workers=max(min(jobs, len(pending)), 1)) as pool:
+        for files in pool.map(compress, pending):
+            compressed += files
+
+    # Assets from earlier builds are no longer referenced by index.html
+    keep = outputs | {name + suffix for name in outputs for suffix in COMPRESSED_SUFFIXES}
+    removed = [path.name for path in site_dir.iterdir() if path.is_file() and path.name not in keep]
+    for name in removed:
+        (site_dir / name).unlink()
+
+    return names, written, compressed, removed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write the site to dist/ with content-hashed asset names and .gz/.br copies")
+    parser.add_argument("--out", type=Path, default=SITE_DIR, help=f"output directory (default: {SITE_DIR.name})")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(),
+                        help="worker processes for compression (default: all cores)")
+    args = parser.parse_args()
+
+    names, written, compressed, removed = build_site(args.out, args.jobs)
+    for name, hashed in names.items():
+        print(f"{name:24s} -> {hashed}" + ("" if hashed in written else "  (unchanged)"))
+    if brotli is None:
+        print("brotli is not installed, so only .gz copies were written (pip install brotli)")
+    print(f"Wrote {len(written)} file(s) and {len(compressed)} compressed copies to {args.out}, removed {len(removed)} stale file(s)")
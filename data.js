@@ -8,6 +8,22 @@ let leaderboardData = [];
 let timeSpentData = [];
 let statistics = {};
 
+// Precomputed by generate_data.py, keyed by view ("average" or a base model)
+// and agent. The calculate* functions are only used for older scores.json
+// files without leaderboardViews.
+let leaderboardViews = null;
+let leaderboardLookup = {};
+
+function indexLeaderboardViews() {
+    leaderboardLookup = {};
+    Object.entries(leaderboardViews).forEach(([view, entries]) => {
+        leaderboardLookup[view] = {};
+        entries.forEach(entry => {
+            leaderboardLookup[view][entry.agentKey] = entry;
+        });
+    });
+}
+
 function calculateWeightedAverage(agentKey) {
     const benchmarks = Object.keys(benchmarkWeights);
     let totalWeightedSum = 0;
@@ -27,6 +43,10 @@ function calculateWeightedAverage(agentKey) {
 }
 
 function calculateWeightedAverageForModel(agentKey, modelName) {
+    if (leaderboardLookup[modelName] && leaderboardLookup[modelName][agentKey]) {
+        return leaderboardLookup[modelName][agentKey].averageScore;
+    }
+
     const benchmarks = Object.keys(benchmarkWeights);
     let weightedSum = 0;
 
@@ -61,6 +81,14 @@ function calculateWeightedAverageStd(agentKey) {
 }
 
 function getAverageBenchmarkScores(agentKey) {
+    if (leaderboardLookup.average && leaderboardLookup.average[agentKey]) {
+        const avgScores = {};
+        Object.entries(leaderboardLookup.average[agentKey].benchmarkScores).forEach(([benchmark, score]) => {
+            avgScores[benchmark] = { value: score.value, std: score.std, fallbackType: false };
+        });
+        return avgScores;
+    }
+
     const benchmarks = Object.keys(benchmarkWeights);
     const avgScores = {};
 
@@ -90,6 +118,9 @@ function getAverageBenchmarkScores(agentKey) {
 }
 
 function getAverageScore(agentKey) {
+    if (leaderboardLookup.average && leaderboardLookup.average[agentKey]) {
+        return leaderboardLookup.average[agentKey].averageScore;
+    }
     if (aggregatedScores[agentKey]) {
         return aggregatedScores[agentKey].avg.toFixed(2);
     }
@@ -97,6 +128,9 @@ function getAverageScore(agentKey) {
 }
 
 function getStdDev(agentKey) {
+    if (leaderboardLookup.average && leaderboardLookup.average[agentKey]) {
+        return leaderboardLookup.average[agentKey].stdDev;
+    }
     if (aggregatedScores[agentKey]) {
         return aggregatedScores[agentKey].std.toFixed(2);
     }
@@ -104,7 +138,12 @@ function getStdDev(agentKey) {
 }
 
 function buildLeaderboardData() {
-    const leaderboardDataRaw = allAgentKeys
+    // The precomputed "average" view is already sorted by score
+    const agentKeys = leaderboardViews
+        ? leaderboardViews.average.map(entry => entry.agentKey).filter(key => allAgentKeys.includes(key))
+        : allAgentKeys;
+
+    const leaderboardDataRaw = agentKeys
         .filter(key => modelBenchmarkData[key])
         .map(key => ({
             agentKey: key,
@@ -120,7 +159,9 @@ function buildLeaderboardData() {
             showInChart: chartAgentKeys.includes(key)
         }));
 
-    const sorted = leaderboardDataRaw.sort((a, b) => parseFloat(b.averageScore) - parseFloat(a.averageScore));
+    const sorted = leaderboardViews
+        ? leaderboardDataRaw
+        : leaderboardDataRaw.sort((a, b) => parseFloat(b.averageScore) - parseFloat(a.averageScore));
 
     let agentRank = 1;
     leaderboardData = sorted.map(entry => {
@@ -174,6 +215,10 @@ async function loadScoresData() {
         aggregatedScores = data.aggregatedScores || {};
         stdData = data.stdData || {};
         timeData = data.timeData || {};
+        leaderboardViews = data.leaderboardViews || null;
+        if (leaderboardViews) {
+            indexLeaderboardViews();
+        }
 
         buildLeaderboardData();
         buildTaskData();
@@ -0,0 +1,448 @@
+#!/usr/bin/env python3
+"""
+Local dev server with watch mode
+
+Serves the site like `python3 -m http.server` and watches data/ and
+paper-plots/data/. A burst of writes is collected until the directories have
+been quiet for DEBOUNCE seconds, then only what depends on the changed files
+is rebuilt: data/ changes run an incremental build of scores.json (only the
+agents whose inputs changed are re-parsed), and a changed figure CSV
+re-renders the figures that read it. Open pages are told to reload over
+server-sent events from /events once the rebuild succeeded; a failed rebuild
+sends a build-error event instead, which the page logs to its console.
+
+Files are served from an in-memory cache keyed on mtime, with strong content
+ETags (304 on revalidation), byte ranges, and .br/.gz siblings or in-memory
+gzip when the client accepts them. Requests are handled on threads over
+HTTP/1.1 keep-alive, so it can stand in for the production host when load
+testing the page.
+
+    python3 dev_server.py              # http://localhost:8000
+    python3 dev_server.py --port 9000 --no-watch --quiet
+"""
+
+import argparse
+import email.utils
+import gzip
+import hashlib
+import os
+import queue
+import sys
+import threading
+import time
+import traceback
+from dataclasses import dataclass
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import generate_data
+
+ROOT_DIR = Path(__file__).resolve().parent
+FIGURES_DIR = ROOT_DIR / "paper-plots"
+WATCH_DIRS = [ROOT_DIR / generate_data.DATA_DIR, FIGURES_DIR / "data"]
+
+POLL_INTERVAL = 0.05
+DEBOUNCE = 0.15
+KEEPALIVE = 15.0
+
+# Served instead of the file when the client accepts the encoding, in order
+# of preference. Other compressible files are gzipped in memory.
+PRECOMPRESSED = {"br": ".br", "gzip": ".gz"}
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/javascript", "image/svg+xml")
+MIN_COMPRESS_SIZE = 1024
+
+# Injected into every HTML page the server returns
+RELOAD_SNIPPET = b"""<script>
+const events = new EventSource("/events");
+events.addEventListener("reload", () => location.reload());
+events.addEventListener("build-error", event => console.error(`Rebuild failed: ${event.data}`));
+</script>
+"""
+
+
+def inject_reload(html):
+    return html.replace(b"</body>", RELOAD_SNIPPET + b"</body>", 1)
+
+
+def snapshot(dirs):
+    files = {}
+    for directory in dirs:
+        for parent, _, filenames in os.walk(directory):
+            for filename in filenames:
+                path = Path(parent) / filename
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                files[path] = (stat.st_size, stat.st_mtime_ns)
+    return files
+
+
+class EventHub:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.clients = []
+
+    def subscribe(self):
+        client = queue.Queue()
+        with self.lock:
+            self.clients.append(client)
+        return client
+
+    def unsubscribe(self, client):
+        with self.lock:
+            self.clients.remove(client)
+
+    def publish(self, event, data=""):
+        with self.lock:
+            for client in self.clients:
+                client.put((event, data))
+
+
+class Watcher(threading.Thread):
+    # Polls file sizes and mtimes. The watched trees are a few hundred files,
+    # so a full stat pass is far cheaper than the debounce window.
+    def __init__(self, dirs, on_change):
+        super().__init__(daemon=True)
+        self.dirs = dirs
+        self.on_change = on_change
+
+    def run(self):
+        files = snapshot(self.dirs)
+        pending = set()
+        last_change = 0.0
+        while True:
+            time.sleep(POLL_INTERVAL)
+            current = snapshot(self.dirs)
+            changed = {path for path in files.keys() | current.keys() if files.get(path) != current.get(path)}
+            files = current
+            if changed:
+                pending |= changed
+                last_change = time.monotonic()
+            elif pending and time.monotonic() - last_change >= DEBOUNCE:
+                try:
+                    self.on_change(pending)
+                except Exception:
+                    traceback.print_exc()
+                pending = set()
+
+
+class Rebuilder:
+    def __init__(self, events):
+        self.events = events
+        self.figure_inputs = None
+
+    def load_figures(self):
+        # Maps each figure CSV to the scripts that read it. Loading the
+        # scripts also imports matplotlib, so do it before the first edit.
+        sys.path.insert(0, str(FIGURES_DIR))
+        from build_figures import discover_figures, load_figure_module
+
+        self.figure_inputs = {}
+        for script in discover_figures():
+            module = load_figure_module(script)
+            self.figure_inputs.setdefault(Path(module.DATA_PATH).resolve(), []).append(script)
+
+    def __call__(self, changed):
+        start = time.perf_counter()
+        data_dir = WATCH_DIRS[0]
+        # Pages only reload onto a finished build; a failed one is reported
+        # instead, and they keep showing what they have
+        if any(path.is_relative_to(data_dir) for path in changed):
+            error = self.rebuild_scores()
+            if error is None:
+                self.events.publish("reload", "scores.json")
+                print(f"scores.json ready in {time.perf_counter() - start:.2f}s")
+            else:
+                self.events.publish("build-error", f"scores.json: {error}")
+
+        scripts = sorted({script for path in changed for script in self.figure_inputs.get(path.resolve(), [])})
+        if scripts:
+            failed = self.render_figures(scripts)
+            if not failed:
+                self.events.publish("reload", " ".join(script.stem for script in scripts))
+                print(f"{len(scripts)} figure(s) ready in {time.perf_counter() - start:.2f}s")
+            else:
+                self.events.publish("build-error", f"failed to render {' '.join(failed)}")
+
+    def rebuild_scores(self):
+        # None on success, else the exception's last traceback line
+        try:
+            generate_data.generate_scores_json(incremental=True)
+        except Exception:
+            traceback.print_exc()
+            return traceback.format_exc().strip().splitlines()[-1]
+        return None
+
+    def render_figures(self, scripts):
+        # Names of the outputs that failed to render
+        import figure_cache
+        from build_figures import FORMATS, render
+
+        failed = []
+        for script in scripts:
+            for fmt in figure_cache.stale_formats(script, FORMATS):
+                name, fmt, elapsed, error, log = render(script, fmt, None)
+                if error:
+                    print(f"FAILED {name}.{fmt}\n{log}{error}")
+                    failed.append(f"{name}.{fmt}")
+                else:
+                    print(f"Rendered {name}.{fmt} in {elapsed:.2f}s")
+        return failed
+
+
+@dataclass
+class CachedFile:
+    key: tuple
+    content_type: str
+    last_modified: str
+    mtime: int
+    # encoding ("identity", "br", "gzip") -> (body, strong ETag)
+    variants: dict
+
+
+def variant_path(path, suffix):
+    return path.with_name(path.name + suffix)
+
+
+def stat_key(path):
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def is_compressible(content_type):
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+class FileCache:
+    # Bodies, their compressed variants and ETags are kept in memory and
+    # rebuilt when the file or one of its .br/.gz siblings changes, so a
+    # request for an unchanged file costs a few stats.
+    def __init__(self, inject=None):
+        self.inject = inject
+        self.lock = threading.Lock()
+        self.files = {}
+
+    def get(self, path, content_type):
+        key = tuple(stat_key(variant_path(path, suffix)) for suffix in ("",) + tuple(PRECOMPRESSED.values()))
+        if key[0] is None:
+            return None
+        cached = self.files.get(path)
+        if cached is None or cached.key != key:
+            cached = self.load(path, content_type, key)
+            with self.lock:
+                self.files[path] = cached
+        return cached
+
+    def load(self, path, content_type, key):
+        body = path.read_bytes()
+        transformed = self.inject is not None and content_type == "text/html"
+        if transformed:
+            body = self.inject(body)
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        variants = {"identity": (body, f'"{digest}"')}
+
+        # Precompressed siblings are used as long as they are not older than
+        # the file; they don't apply to HTML the server rewrites
+        for (encoding, suffix), variant_key in zip(PRECOMPRESSED.items(), key[1:]):
+            if variant_key is not None and not transformed and variant_key[0] >= key[0][0]:
+                variants[encoding] = (variant_path(path, suffix).read_bytes(), f'"{digest}-{encoding}"')
+        if "gzip" not in variants and is_compressible(content_type) and len(body) >= MIN_COMPRESS_SIZE:
+            compressed = gzip.compress(body, compresslevel=6, mtime=0)
+            if len(compressed) < len(body):
+                variants["gzip"] = (compressed, f'"{digest}-gzip"')
+
+        mtime = key[0][0] // 10**9
+        return CachedFile(key, content_type, email.utils.formatdate(mtime, usegmt=True), mtime, variants)
+
+
+def accepted_encodings(header):
+    accepted = set()
+    for item in (header or "").split(","):
+        coding, _, params = item.strip().partition(";")
+        q = params.strip().removeprefix("q=")
+        try:
+            if params and float(q) == 0:
+                continue
+        except ValueError:
+            continue
+        accepted.add(coding.strip().lower())
+    return accepted
+
+
+def parse_range(header, size):
+    # Single "bytes=" ranges only; anything else is served as a full response
+    unit, _, spec = (header or "").partition("=")
+    if unit.strip() != "bytes" or "," in spec:
+        return None
+    first, _, last = spec.strip().partition("-")
+    try:
+        if not first:
+            start, end = max(size - int(last), 0), size - 1
+        else:
+            start, end = int(first), min(int(last), size - 1) if last else size - 1
+    except ValueError:
+        return None
+    return start, end
+
+
+class DevRequestHandler(SimpleHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    events = None
+    files = None
+    max_age = 0
+    quiet = False
+
+    def end_headers(self):
+        # max_age 0 still lets the browser keep the file, but it revalidates
+        # with the ETag on each load, so a rebuilt scores.json shows up at once
+        self.send_header("Cache-Control", f"max-age={self.max_age}" if self.max_age else "no-cache")
+        super().end_headers()
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+    def do_GET(self):
+        if self.path == "/events":
+            return self.stream_events()
+        self.send_file(head=False)
+
+    def do_HEAD(self):
+        self.send_file(head=True)
+
+    def send_file(self, head):
+        path = Path(self.translate_path(self.path))
+        if path.is_dir() and self.path.split("?", 1)[0].endswith("/"):
+            path = path / "index.html"
+        cached = self.files.get(path, self.guess_type(path)) if path.is_file() else None
+        if cached is None:
+            # Directory redirects and listings, and 404s
+            return super().do_HEAD() if head else super().do_GET()
+
+        accepted = accepted_encodings(self.headers.get("Accept-Encoding"))
+        encoding = next((e for e in PRECOMPRESSED if e in accepted and e in cached.variants), "identity")
+        body, etag = cached.variants[encoding]
+
+        if self.not_modified(cached, etag):
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", cached.last_modified)
+            self.end_headers()
+            return
+
+        status, start, end = 200, 0, len(body) - 1
+        range_header = self.headers.get("Range")
+        if_range = self.headers.get("If-Range")
+        if range_header and (if_range is None or if_range in (etag, cached.last_modified)):
+            # Ranges are always byte ranges of the uncompressed file
+            body, etag = cached.variants["identity"]
+            encoding = "identity"
+            byte_range = parse_range(range_header, len(body))
+            if byte_range is not None:
+                start, end = byte_range
+                if start > end or start >= len(body):
+                    self.send_response(416)
+                    self.send_header("Content-Range", f"bytes */{len(body)}")
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                status = 206
+            else:
+                end = len(body) - 1
+
+        self.send_response(status)
+        self.send_header("Content-Type", cached.content_type)
+        self.send_header("Content-Length", str(end - start + 1))
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", cached.last_modified)
+        self.send_header("Accept-Ranges", "bytes")
+        if len(cached.variants) > 1:
+            self.send_header("Vary", "Accept-Encoding")
+        if encoding != "identity":
+            self.send_header("Content-Encoding", encoding)
+        if status == 206:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(body)}")
+        self.end_headers()
+        if not head:
+            self.wfile.write(memoryview(body)[start:end + 1])
+
+    def not_modified(self, cached, etag):
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match is not None:
+            tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+            return "*" in tags or etag in tags
+        if_modified_since = self.headers.get("If-Modified-Since")
+        if if_modified_since:
+            try:
+                since = email.utils.parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+            return cached.mtime <= since
+        return False
+
+    def stream_events(self):
+        if self.events is None:
+            return self.send_error(404, "Watch mode is off")
+        # The stream has no length, so it ends the keep-alive connection
+        self.close_connection = True
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        client = self.events.subscribe()
+        try:
+            while True:
+                try:
+                    event, data = client.get(timeout=KEEPALIVE)
+                    # Each line of the payload needs its own data field
+                    message = f"event: {event}\n" + "".join(f"data: {line}\n" for line in data.split("\n")) + "\n"
+                except queue.Empty:
+                    message = ": keepalive\n\n"
+                self.wfile.write(message.encode())
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            self.events.unsubscribe(client)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the site and rebuild it when data/ or paper-plots/data/ change")
+    parser.add_argument("--port", type=int, default=8000, help="port to listen on (default: 8000)")
+    parser.add_argument("--bind", default="127.0.0.1", help="address to bind to (default: 127.0.0.1)")
+    parser.add_argument("--no-watch", action="store_true", help="only serve files, don't watch or rebuild")
+    parser.add_argument("--max-age", type=int, default=0,
+                        help="Cache-Control max-age in seconds (default: 0, revalidate every load)")
+    parser.add_argument("--quiet", action="store_true", help="don't log each request, e.g. while load testing")
+    args = parser.parse_args()
+
+    os.chdir(ROOT_DIR)
+    events = None
+    if not args.no_watch:
+        events = EventHub()
+        rebuilder = Rebuilder(events)
+        rebuilder.load_figures()
+        rebuilder.rebuild_scores()
+        Watcher(WATCH_DIRS, rebuilder).start()
+
+    DevRequestHandler.events = events
+    DevRequestHandler.files = FileCache(inject=None if events is None else inject_reload)
+    DevRequestHandler.max_age = args.max_age
+    DevRequestHandler.quiet = args.quiet
+    server = ThreadingHTTPServer((args.bind, args.port), partial(DevRequestHandler, directory=str(ROOT_DIR)))
+    server.daemon_threads = True
+    print(f"Serving {ROOT_DIR} at http://{args.bind}:{args.port}/" + ("" if args.no_watch else " (watching for changes)"))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,341 +1,1338 @@
-#!/usr/bin/env python3
-import csv
-import json
-import os
-from pathlib import Path
-
-DATA_DIR = Path("data")
-OUTPUT_FILE = Path("scores.json")
-
-BASE_MODELS = ["Qwen3-1.7B-Base", "Qwen3-4B-Base", "SmolLM3-3B-Base", "gemma-3-4b-pt"]
-HUMAN_MODELS = ["Qwen3-1.7B", "Qwen3-4B", "SmolLM3-3B", "gemma-3-4b-it"]
-
-AGGREGATED_NAME_TO_KEY = {
-    "GPT-5.2": "gpt-5.2",
-    "GPT-5.1-Codex-Max": "gpt-5.1-codex-max",
-    "GPT-5.2-Codex": "gpt-5.2-codex",
-    "Opus-4.5": "opus-4.5",
-    "Gemini-3-Pro": "gemini-3-pro",
-    "GPT-5.3-Codex_High": "gpt-5.3-codex-high",
-    "GPT-5.3-Codex_Med": "gpt-5.3-codex-med",
-    "Opus-4.6": "opus-4.6",
-    "Gemini-3.1-Pro": "gemini-3.1-pro",
-    "GPT-5.4-High": "gpt-5.4-high",
-    "Opus-4.6-1M": "opus-4.6-1m",
-}
-
-CSV_TO_AGENT = {
-    "aggregated_avg_GPT-5.2.csv": "gpt-5.2",
-    "aggregated_avg_GPT-5.1-Codex-Max.csv": "gpt-5.1-codex-max",
-    "aggregated_avg_GPT-5.2-Codex.csv": "gpt-5.2-codex",
-    "aggregated_avg_Opus-4.5.csv": "opus-4.5",
-    "aggregated_avg_Gemini-3-Pro.csv": "gemini-3-pro",
-    "aggregated_avg_GPT-5.3-Codex_High.csv": "gpt-5.3-codex-high",
-    "aggregated_avg_GPT-5.3-Codex_Med.csv": "gpt-5.3-codex-med",
-    "aggregated_avg_Opus-4.6.csv": "opus-4.6",
-    "aggregated_avg_Gemini-3.1-Pro.csv": "gemini-3.1-pro",
-    "aggregated_avg_GPT-5.4-High.csv": "gpt-5.4-high",
-    "aggregated_avg_Opus-4.6-1M.csv": "opus-4.6-1m",
-}
-
-STD_CSV_TO_AGENT = {
-    "aggregated_std_GPT-5.2.csv": "gpt-5.2",
-    "aggregated_std_GPT-5.1-Codex-Max.csv": "gpt-5.1-codex-max",
-    "aggregated_std_GPT-5.2-Codex.csv": "gpt-5.2-codex",
-    "aggregated_std_Opus-4.5.csv": "opus-4.5",
-    "aggregated_std_Gemini-3-Pro.csv": "gemini-3-pro",
-    "aggregated_std_GPT-5.3-Codex_High.csv": "gpt-5.3-codex-high",
-    "aggregated_std_GPT-5.3-Codex_Med.csv": "gpt-5.3-codex-med",
-    "aggregated_std_Opus-4.6.csv": "opus-4.6",
-    "aggregated_std_Gemini-3.1-Pro.csv": "gemini-3.1-pro",
-    "aggregated_std_GPT-5.4-High.csv": "gpt-5.4-high",
-    "aggregated_std_Opus-4.6-1M.csv": "opus-4.6-1m",
-}
-
-OPENCODE_CSV_TO_AGENT = {
-    "opencode_glm-4.7-free_10h": "glm-4.7",
-    "opencode_minimax-m2.1-free_10h": "minimax-m2.1",
-    "anthropic_claude-opus-4-5_10h": "opus-4.5-opencode",
-    "opencode_gemini-3-pro_10h": "gemini-3-pro-opencode",
-    "opencode_gpt-5.1-codex-max_10h": "gpt-5.1-codex-max-opencode",
-    "opencode_kimi-k2-thinking_10h": "kimi-k2",
-    "opencode_kimi-k2.5_10h_run2": "kimi-k2.5",
-    "opencode_minimax-m2.5-free_10h_run2": "minimax-m2.5",
-    "zai_glm-5_10h_run2": "glm-5",
-}
-
-QWEN3MAX_KEY = "qwen3-max"
-SONNET_KEY = "sonnet-4.5"
-SONNET46_KEY = "sonnet-4.6"
-
-BENCHMARKS = ["aime2025", "arenahardwriting", "bfcl", "gpqamain", "gsm8k", "healthbench", "humaneval"]
-
-TIME_OVERVIEW_TO_KEY = {
-    "baseline": "human",
-    "opencode_anthropic_claude-opus-4-5_10h": "opus-4.5-opencode",
-    "opencode_opencode_gemini-3-pro_10h": "gemini-3-pro-opencode",
-    "opencode_opencode_glm-4.7-free_10h": "glm-4.7",
-    "opencode_opencode_gpt-5.1-codex-max_10h": "gpt-5.1-codex-max-opencode",
-    "opencode_opencode_kimi-k2-thinking_10h": "kimi-k2",
-    "opencode_opencode_minimax-m2.1-free_10h": "minimax-m2.1",
-    "qwen3max_qwen3-max-2026-01-23_10h": "qwen3-max",
-    "opencode_opencode_kimi-k2.5_10h_run2": "kimi-k2.5",
-    "opencode_opencode_minimax-m2.5-free_10h_run2": "minimax-m2.5",
-    "opencode_zai_glm-5_10h_run2": "glm-5",
-    "claude_non_api_claude-sonnet-4-6_10h": "sonnet-4.6",
-    "opencode_opencode_gemini-3.1-pro_10h_run2": "gemini-3.1-pro",
-}
-
-TIME_AGGREGATED_TO_KEY = {
-    "Opus-4.5": "opus-4.5",
-    "GPT-5.1-Codex-Max": "gpt-5.1-codex-max",
-    "GPT-5.2-Codex": "gpt-5.2-codex",
-    "GPT-5.2": "gpt-5.2",
-    "Gemini-3-Pro": "gemini-3-pro",
-    "GPT-5.3-Codex_High": "gpt-5.3-codex-high",
-    "GPT-5.3-Codex_Med": "gpt-5.3-codex-med",
-    "Opus-4.6": "opus-4.6",
-    "Gemini-3.1-Pro": "gemini-3.1-pro",
-    "GPT-5.4-High": "gpt-5.4-high",
-    "Opus-4.6-1M": "opus-4.6-1m",
-}
-
-
-def read_csv(filepath):
-    data = {}
-    with open(filepath, 'r') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            model = row['model']
-            data[model] = {bm: row[bm] for bm in BENCHMARKS}
-    return data
-
-
-def read_json(filepath):
-    with open(filepath, 'r') as f:
-        return json.load(f)
-
-
-def to_percentage(val):
-    return round(float(val) * 100, 2)
-
-
-def parse_time_to_hours(time_str):
-    parts = time_str.split(':')
-    if len(parts) == 3:
-        hours, minutes, seconds = map(int, parts)
-        return round(hours + minutes/60 + seconds/3600, 3)
-    elif len(parts) == 2:
-        minutes, seconds = map(int, parts)
-        return round(minutes/60 + seconds/3600, 3)
-    return 0
-
-
-def format_time_display(time_str):
-    parts = time_str.split(':')
-    if len(parts) == 3:
-        hours, minutes, _ = parts
-        return f"{int(hours)}:{minutes}"
-    return time_str
-
-
-def load_time_data():
-    time_data = {}
-
-    time_agg_file = DATA_DIR / "time_aggregated.csv"
-    if time_agg_file.exists():
-        with open(time_agg_file, 'r') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                agent_name = row['agent']
-                if agent_name in TIME_AGGREGATED_TO_KEY:
-                    agent_key = TIME_AGGREGATED_TO_KEY[agent_name]
-                    time_data[agent_key] = {
-                        "hours": parse_time_to_hours(row['avg_time']),
-                        "time": format_time_display(row['avg_time']),
-                        "stdHours": parse_time_to_hours(row['std_time']),
-                        "stdTime": format_time_display(row['std_time']),
-                        "n": int(row['n'])
-                    }
-
-    time_overview_file = DATA_DIR / "aggregated_time_overview.csv"
-    if time_overview_file.exists():
-        with open(time_overview_file, 'r') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                method = row['method']
-                if method in TIME_OVERVIEW_TO_KEY:
-                    agent_key = TIME_OVERVIEW_TO_KEY[method]
-                    if agent_key not in time_data:
-                        time_data[agent_key] = {
-                            "hours": parse_time_to_hours(row['average_time']),
-                            "time": format_time_display(row['average_time']),
-                            "stdHours": None,
-                            "stdTime": None,
-                            "n": 1
-                        }
-
-    return time_data
-
-
-def generate_scores_json():
-    weights = read_json(DATA_DIR / "factors.json")
-    baseline_data = read_csv(DATA_DIR / "aggregated_baseline.csv")
-    baseline_fewshot_data = read_csv(DATA_DIR / "aggregated_baseline_fewshot.csv")
-
-    model_benchmark_data = {}
-
-    model_benchmark_data["base-model"] = {}
-    for model in BASE_MODELS:
-        model_benchmark_data["base-model"][model] = {}
-        for bm in BENCHMARKS:
-            val = to_percentage(baseline_data[model][bm])
-            model_benchmark_data["base-model"][model][bm] = {"value": val, "fallbackType": False}
-
-    model_benchmark_data["base-model-fewshot"] = {}
-    for model in BASE_MODELS:
-        model_benchmark_data["base-model-fewshot"][model] = {}
-        for bm in BENCHMARKS:
-            val = to_percentage(baseline_fewshot_data[model][bm])
-            model_benchmark_data["base-model-fewshot"][model][bm] = {"value": val, "fallbackType": False}
-
-    model_benchmark_data["human"] = {}
-    for base_model, human_model in zip(BASE_MODELS, HUMAN_MODELS):
-        model_benchmark_data["human"][base_model] = {}
-        for bm in BENCHMARKS:
-            val = to_percentage(baseline_data[human_model][bm])
-            model_benchmark_data["human"][base_model][bm] = {"value": val, "fallbackType": False}
-
-    for csv_file, agent_key in CSV_TO_AGENT.items():
-        filepath = DATA_DIR / csv_file
-        if filepath.exists():
-            agent_data = read_csv(filepath)
-            model_benchmark_data[agent_key] = {}
-            for model in BASE_MODELS:
-                model_benchmark_data[agent_key][model] = {}
-                for bm in BENCHMARKS:
-                    val = to_percentage(agent_data[model][bm])
-                    model_benchmark_data[agent_key][model][bm] = {"value": val, "fallbackType": False}
-
-    sonnet_files = list(DATA_DIR.glob("final_claude_claude-sonnet-*.csv"))
-    if sonnet_files:
-        sonnet_data = read_csv(sonnet_files[0])
-        model_benchmark_data[SONNET_KEY] = {}
-        for model in BASE_MODELS:
-            model_benchmark_data[SONNET_KEY][model] = {}
-            for bm in BENCHMARKS:
-                val = to_percentage(sonnet_data[model][bm])
-                model_benchmark_data[SONNET_KEY][model][bm] = {"value": val, "fallbackType": False}
-
-    for suffix, agent_key in OPENCODE_CSV_TO_AGENT.items():
-        agg_file = DATA_DIR / f"aggregated_opencode_{suffix}.csv"
-        final_file = DATA_DIR / f"final_opencode_{suffix}.csv"
-
-        if agg_file.exists() and final_file.exists():
-            agg_data = read_csv(agg_file)
-            final_data = read_csv(final_file)
-
-            model_benchmark_data[agent_key] = {}
-            for model in BASE_MODELS:
-                model_benchmark_data[agent_key][model] = {}
-                for bm in BENCHMARKS:
-                    agg_val = agg_data[model][bm]
-                    final_val = to_percentage(final_data[model][bm])
-
-                    if agg_val == "not stored":
-                        fallback_type = "not_stored"
-                    elif agg_val == "ERR":
-                        fallback_type = "error"
-                    else:
-                        fallback_type = False
-
-                    model_benchmark_data[agent_key][model][bm] = {"value": final_val, "fallbackType": fallback_type}
-
-    qwen3max_agg = DATA_DIR / "aggregated_qwen3max_qwen3-max-2026-01-23_10h.csv"
-    qwen3max_final = DATA_DIR / "final_qwen3max_qwen3-max-2026-01-23_10h.csv"
-    if qwen3max_agg.exists() and qwen3max_final.exists():
-        agg_data = read_csv(qwen3max_agg)
-        final_data = read_csv(qwen3max_final)
-        model_benchmark_data[QWEN3MAX_KEY] = {}
-        for model in BASE_MODELS:
-            model_benchmark_data[QWEN3MAX_KEY][model] = {}
-            for bm in BENCHMARKS:
-                agg_val = agg_data[model][bm]
-                final_val = to_percentage(final_data[model][bm])
-
-                if agg_val == "not stored":
-                    fallback_type = "not_stored"
-                elif agg_val == "ERR":
-                    fallback_type = "error"
-                else:
-                    fallback_type = False
-
-                model_benchmark_data[QWEN3MAX_KEY][model][bm] = {"value": final_val, "fallbackType": fallback_type}
-
-    sonnet46_agg = DATA_DIR / "aggregated_claude_non_api_claude-sonnet-4-6_10h.csv"
-    sonnet46_final = DATA_DIR / "final_claude_non_api_claude-sonnet-4-6_10h.csv"
-    if sonnet46_agg.exists() and sonnet46_final.exists():
-        agg_data = read_csv(sonnet46_agg)
-        final_data = read_csv(sonnet46_final)
-        model_benchmark_data[SONNET46_KEY] = {}
-        for model in BASE_MODELS:
-            model_benchmark_data[SONNET46_KEY][model] = {}
-            for bm in BENCHMARKS:
-                agg_val = agg_data[model][bm]
-                final_val = to_percentage(final_data[model][bm])
-
-                if agg_val == "not stored":
-                    fallback_type = "not_stored"
-                elif agg_val == "ERR":
-                    fallback_type = "error"
-                else:
-                    fallback_type = False
-
-                model_benchmark_data[SONNET46_KEY][model][bm] = {"value": final_val, "fallbackType": fallback_type}
-
-    aggregated_scores = {}
-    aggregated_file = DATA_DIR / "single_metrics_aggregated.csv"
-    if aggregated_file.exists():
-        with open(aggregated_file, 'r') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                agent_name = row['agent']
-                if agent_name in AGGREGATED_NAME_TO_KEY:
-                    agent_key = AGGREGATED_NAME_TO_KEY[agent_name]
-                    aggregated_scores[agent_key] = {
-                        "avg": round(float(row['avg']) * 100, 2),
-                        "std": round(float(row['std']) * 100, 2),
-                        "n": int(row['n'])
-                    }
-
-    std_data = {}
-    for csv_file, agent_key in STD_CSV_TO_AGENT.items():
-        filepath = DATA_DIR / csv_file
-        if filepath.exists():
-            agent_std = read_csv(filepath)
-            std_data[agent_key] = {}
-            for model in BASE_MODELS:
-                std_data[agent_key][model] = {}
-                for bm in BENCHMARKS:
-                    val = to_percentage(agent_std[model][bm])
-                    std_data[agent_key][model][bm] = val
-
-    time_data = load_time_data()
-
-    output = {
-        "benchmarkWeights": weights,
-        "modelBenchmarkData": model_benchmark_data,
-        "aggregatedScores": aggregated_scores,
-        "stdData": std_data,
-        "timeData": time_data
-    }
-
-    with open(OUTPUT_FILE, 'w') as f:
-        json.dump(output, f, indent=2)
-
-    print(f"Generated {OUTPUT_FILE}")
-
-
-if __name__ == "__main__":
-    os.chdir(Path(__file__).parent)
-    generate_scores_json()
+#!/usr/bin/env python3
+import argparse
+import base64
+import contextlib
+import cProfile
+import csv
+import functools
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+import tracemalloc
+import zlib
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from itertools import repeat
+from decimal import ROUND_HALF_UP, Decimal
+from pathlib import Path
+
+import numpy as np
+
+from pareto import pareto_mask
+from parsed_cache import content_hash, read_table
+
+DATA_DIR = Path("data")
+OUTPUT_FILE = Path("scores.json")
+CACHE_DIR = Path(".cache")
+MANIFEST_FILE = CACHE_DIR / "build_manifest.json"
+TENSOR_CACHE_FILE = CACHE_DIR / "tensor.npz"
+REGISTRY_CACHE_FILE = CACHE_DIR / "registry.json"
+PROFILE_FILE = CACHE_DIR / "build_profile.json"
+# SQLite copy of data/ written by results_store.py (see --store)
+RESULTS_STORE_FILE = CACHE_DIR / "results.sqlite"
+WRITE_BUFFER_SIZE = 1 << 16
+# data/runs/<label>/ holds one CSV per run (same layout as the final_*.csv
+# files) and an optional time.csv with a "run,time" row per run.
+RUNS_DIR = DATA_DIR / "runs"
+RUN_TIME_FILE = "time.csv"
+
+BASE_MODELS = ["Qwen3-1.7B-Base", "Qwen3-4B-Base", "SmolLM3-3B-Base", "gemma-3-4b-pt"]
+HUMAN_MODELS = ["Qwen3-1.7B", "Qwen3-4B", "SmolLM3-3B", "gemma-3-4b-it"]
+
+BASELINE_KEYS = {"base-model", "base-model-fewshot", "human"}
+
+BENCHMARKS = ["aime2025", "arenahardwriting", "bfcl", "gpqamain", "gsm8k", "healthbench", "humaneval"]
+
+# Agent keys are derived from file names (see scan_data_dir). These are the
+# names whose key does not follow the rules.
+AGENT_ALIASES = {
+    "baseline": "human",
+    "opencode_opencode_kimi-k2-thinking_10h": "kimi-k2",
+    # Single run that is already part of the aggregated_avg_Gemini-3.1-Pro average.
+    "opencode_opencode_gemini-3.1-pro_10h_run2": "gemini-3.1-pro",
+}
+
+# Labels whose files are kept in data/ but are not published as an agent.
+IGNORED_LABELS = {
+    # Superseded by the GPT-5.3-Codex_High and GPT-5.3-Codex_Med runs.
+    "GPT-5.3-Codex",
+}
+
+NON_AGENT_FILES = {
+    "aggregated_baseline.csv",
+    "aggregated_baseline_fewshot.csv",
+    "aggregated_time_overview.csv",
+    "single_metrics_aggregated.csv",
+    "time_aggregated.csv",
+}
+
+RUN_TRAILING_TOKEN = re.compile(r"^(\d+h|run\d+|final|v\d+)$")
+
+BOOTSTRAP_SEED = 0
+CI_LEVEL = 0.95
+# Upper bound on simulated values held in memory at once per agent
+BOOTSTRAP_CHUNK = 1 << 22
+
+SIGNIFICANCE_SEED = 0
+# Upper bound on permuted statistics held in memory at once per worker
+SIGNIFICANCE_CHUNK = 1 << 22
+
+WEIGHT_SENSITIVITY_SEED = 0
+# Dirichlet concentration around factors.json; larger keeps samples closer to it
+WEIGHT_CONCENTRATION = 100.0
+# Weight samples per chunk; chunks (not workers) own a seed, so results don't depend on --jobs
+WEIGHT_SAMPLE_CHUNK = 1 << 16
+
+
+def model_rows(table, models=None):
+    # Resolved at call time so BASE_MODELS can be swapped (benchmarks/ does)
+    models = BASE_MODELS if models is None else models
+    rows = {model: i for i, model in enumerate(table['model'].tolist())}
+    return models, [rows[model] for model in models]
+
+
+def fallback_codes(table, index):
+    codes = np.zeros((len(index), len(BENCHMARKS)), dtype=np.uint8)
+    for b, bm in enumerate(BENCHMARKS):
+        if table.is_text(bm):
+            cells = table[bm][index]
+            for marker, code in FALLBACK_CODES.items():
+                codes[cells == marker, b] = code
+    return codes
+
+
+def read_cells(filepath, models=None, markers=True):
+    # (values, fallback codes) of the base model x benchmark cells; marker
+    # cells such as "ERR" are NaN in values and carry their code instead.
+    # With markers=False every cell must be a number.
+    table = read_table(filepath)
+    models, index = model_rows(table, models)
+    values = np.column_stack([table.numeric(bm)[index] for bm in BENCHMARKS])
+    codes = fallback_codes(table, index)
+    # Any other cell that is not a number is broken, not missing: a NaN would
+    # end up in scores.json, which JSON.parse rejects
+    broken = np.isnan(values) & (codes == 0) if markers else np.isnan(values)
+    for m, b in np.argwhere(broken):
+        cell = table[BENCHMARKS[b]][index[m]] if table.is_text(BENCHMARKS[b]) else ""
+        raise ValueError(f"{filepath}: row {models[m]}, column {BENCHMARKS[b]} is not a number: {str(cell)!r}")
+    return values, codes
+
+
+def read_codes(filepath):
+    # Fallback codes only; the file's values (and any other markers) are unused
+    table = read_table(filepath)
+    return fallback_codes(table, model_rows(table)[1])
+
+
+def read_matrix(filepath, models=None):
+    return read_cells(filepath, models, markers=False)[0]
+
+
+def read_json(filepath):
+    with open(filepath, 'r') as f:
+        return json.load(f)
+
+
+def to_percentage(val):
+    # Python's round() rounds the exact binary value, np.round scales by 100 first and
+    # lands on the other side of ties like 57.265, so round each value the Python way
+    scaled = np.asarray(val, dtype=np.float64) * 100
+    rounded = [round(v, 2) for v in scaled.ravel().tolist()]
+    return np.array(rounded, dtype=np.float64).reshape(scaled.shape)[()]
+
+
+def parse_time_to_hours(time_str):
+    parts = time_str.split(':')
+    if len(parts) == 3:
+        hours, minutes, seconds = map(int, parts)
+        return round(hours + minutes/60 + seconds/3600, 3)
+    elif len(parts) == 2:
+        minutes, seconds = map(int, parts)
+        return round(minutes/60 + seconds/3600, 3)
+    return 0
+
+
+def format_time_display(time_str):
+    parts = time_str.split(':')
+    if len(parts) == 3:
+        hours, minutes, _ = parts
+        return f"{int(hours)}:{minutes}"
+    return time_str
+
+
+def load_time_data(names, agent_keys, seconds=None):
+    # timeData entries; `seconds`, if given, also gets each agent's unrounded
+    # (avg, std) in seconds, since "hours" keeps only 3 decimals
+    time_data = {}
+    seconds = {} if seconds is None else seconds
+
+    time_agg_file = DATA_DIR / "time_aggregated.csv"
+    if time_agg_file.exists():
+        with open(time_agg_file, 'r') as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                agent_key = names.get(row['agent'])
+                if agent_key in agent_keys:
+                    time_data[agent_key] = {
+                        "hours": parse_time_to_hours(row['avg_time']),
+                        "time": format_time_display(row['avg_time']),
+                        "stdHours": parse_time_to_hours(row['std_time']),
+                        "stdTime": format_time_display(row['std_time']),
+                        "n": int(row['n'])
+                    }
+                    seconds[agent_key] = (time_to_seconds(row['avg_time']), time_to_seconds(row['std_time']))
+
+    time_overview_file = DATA_DIR / "aggregated_time_overview.csv"
+    if time_overview_file.exists():
+        with open(time_overview_file, 'r') as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                agent_key = names.get(row['method'])
+                if agent_key in agent_keys:
+                    if agent_key not in time_data:
+                        time_data[agent_key] = {
+                            "hours": parse_time_to_hours(row['average_time']),
+                            "time": format_time_display(row['average_time']),
+                            "stdHours": None,
+                            "stdTime": None,
+                            "n": 1
+                        }
+                        seconds[agent_key] = (time_to_seconds(row['average_time']), None)
+
+    return time_data
+
+
+# Fallback codes stored in ScoreTensor.fallback; the index is the code and the
+# entry is the "fallbackType" written to scores.json.
+FALLBACK_TYPES = [False, "not_stored", "error"]
+FALLBACK_CODES = {"not stored": 1, "ERR": 2}
+# Agents with at least this share of cells filled from the base model are reported after the build
+FALLBACK_WARNING_SHARE = 0.5
+
+
+@dataclass
+class ScoreTensor:
+    agents: list
+    values: np.ndarray  # (agent, base_model, benchmark) percentages
+    fallback: np.ndarray  # same shape, uint8 index into FALLBACK_TYPES
+    std: np.ndarray  # same shape, NaN where the agent has no std data
+    has_std: np.ndarray  # (agent,) bool
+
+    @classmethod
+    def empty(cls, agents):
+        shape = (len(agents), len(BASE_MODELS), len(BENCHMARKS))
+        return cls(
+            agents=list(agents),
+            values=np.full(shape, np.nan),
+            fallback=np.zeros(shape, dtype=np.uint8),
+            std=np.full(shape, np.nan),
+            has_std=np.zeros(len(agents), dtype=bool),
+        )
+
+    def save(self, filepath):
+        np.savez(filepath, agents=np.array(self.agents, dtype=str), values=self.values,
+                 fallback=self.fallback, std=self.std, has_std=self.has_std)
+
+    @classmethod
+    def load(cls, filepath):
+        with np.load(filepath) as npz:
+            return cls(agents=npz["agents"].tolist(), values=npz["values"], fallback=npz["fallback"],
+                       std=npz["std"], has_std=npz["has_std"])
+
+
+def load_scores(filepath, models=None):
+    values = to_percentage(read_matrix(filepath, models))
+    return values, np.zeros(values.shape, dtype=np.uint8)
+
+
+def load_merged_scores(agg_file, final_file):
+    # Every aggregated_*/final_* pair goes through here: both files are aligned
+    # by base model and benchmark name, values come from final_* and the
+    # fallback code of each cell from the markers in aggregated_*
+    return to_percentage(read_matrix(final_file)), read_codes(agg_file)
+
+
+def load_std(filepath):
+    return to_percentage(read_matrix(filepath))
+
+
+def load_aggregated_scores(filepath, names, agent_keys):
+    aggregated_scores = {}
+    with open(filepath, 'r') as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            agent_key = names.get(row['agent'])
+            if agent_key in agent_keys:
+                aggregated_scores[agent_key] = {
+                    "avg": float(to_percentage(row['avg'])),
+                    "std": float(to_percentage(row['std'])),
+                    "n": int(row['n'])
+                }
+    return aggregated_scores
+
+
+@dataclass
+class RunningStats:
+    # Welford's online mean/variance, elementwise over an array of any shape.
+    n: np.ndarray
+    mean: np.ndarray
+    m2: np.ndarray
+
+    @classmethod
+    def empty(cls, shape=()):
+        return cls(n=np.zeros(shape, dtype=np.int64), mean=np.zeros(shape), m2=np.zeros(shape))
+
+    def add(self, sample):
+        # NaN entries are missing from this sample and leave their cell as is
+        sample = np.asarray(sample, dtype=np.float64)
+        valid = ~np.isnan(sample)
+        self.n = self.n + valid
+        delta = np.where(valid, sample - self.mean, 0.0)
+        self.mean = self.mean + delta / np.maximum(self.n, 1)
+        self.m2 = self.m2 + np.where(valid, delta * (sample - self.mean), 0.0)
+
+    @property
+    def std(self):
+        # Sample standard deviation, like the aggregated_std_*.csv files; 0 below two samples
+        return np.sqrt(np.where(self.n > 1, self.m2, 0.0) / np.maximum(self.n - 1, 1))
+
+
+@dataclass
+class RunSummary:
+    scores: RunningStats  # (base_model, benchmark) fractions
+    fallback: np.ndarray  # fallback code for cells that no run has a value for
+    overall: RunningStats  # per-run weighted average, as in single_metrics_aggregated.csv
+    hours: RunningStats
+
+
+def time_to_seconds(time_str):
+    seconds = 0
+    for part in time_str.split(':'):
+        seconds = seconds * 60 + int(part)
+    return seconds
+
+
+def format_seconds(seconds):
+    seconds = int(round(seconds))
+    return f"{seconds // 3600}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
+def run_inputs(run_dir):
+    # factors.json is an input because the per-run overall score depends on it,
+    # the baseline because cells without any run fall back to the base model.
+    # The listing itself is part of the agent's sources, so adding or removing
+    # a run rebuilds the agent under --incremental.
+    with os.scandir(run_dir) as entries:
+        filenames = sorted(entry.name for entry in entries if entry.name.endswith(".csv"))
+    return [DATA_DIR / "factors.json", DATA_DIR / "aggregated_baseline.csv"] + [run_dir / filename for filename in filenames]
+
+
+@functools.lru_cache(maxsize=None)
+def ingest_runs(factors_file, baseline_file, *files):
+    # Runs are read one at a time into running statistics, so memory does not
+    # grow with the number of runs. Scores and std of an agent come from the
+    # same files, hence the cache.
+    weights = read_json(factors_file)
+    w = np.array([weights[bm] for bm in BENCHMARKS])
+    shape = (len(BASE_MODELS), len(BENCHMARKS))
+    summary = RunSummary(scores=RunningStats.empty(shape), fallback=np.zeros(shape, dtype=np.uint8),
+                         overall=RunningStats.empty(), hours=RunningStats.empty())
+
+    for filepath in files:
+        if filepath.name == RUN_TIME_FILE:
+            with open(filepath, 'r') as f:
+                for row in csv.DictReader(f):
+                    summary.hours.add(time_to_seconds(row['time']) / 3600)
+            continue
+        values, codes = read_cells(filepath)
+        summary.scores.add(values)
+        summary.fallback = np.where(codes > 0, codes, summary.fallback)
+        # Only complete runs have an overall score
+        summary.overall.add((values @ w).mean())
+
+    # Like the final_* files of merged agents, cells that no run has a value
+    # for hold the base model's score and keep the fallback code
+    missing = summary.scores.n == 0
+    summary.scores.mean[missing] = read_matrix(baseline_file)[missing]
+    summary.fallback[~missing] = 0
+    return summary
+
+
+def load_run_scores(*files):
+    summary = ingest_runs(*files)
+    return to_percentage(summary.scores.mean), summary.fallback
+
+
+def load_run_std(*files):
+    return to_percentage(ingest_runs(*files).scores.std)
+
+
+def add_run_aggregated_scores(aggregated_scores, scores):
+    for agent_key, (loader, files) in scores.items():
+        overall = ingest_runs(*files).overall if loader is load_run_scores else None
+        if overall is not None and overall.n > 0:
+            aggregated_scores[agent_key] = {
+                "avg": float(to_percentage(overall.mean)),
+                "std": float(to_percentage(overall.std)),
+                "n": int(overall.n)
+            }
+
+
+def add_run_time_data(time_data, scores, seconds=None):
+    seconds = {} if seconds is None else seconds
+    for agent_key, (loader, files) in scores.items():
+        hours = ingest_runs(*files).hours if loader is load_run_scores else None
+        if hours is not None and hours.n > 0:
+            seconds[agent_key] = (float(hours.mean) * 3600, float(hours.std) * 3600 if hours.n > 1 else None)
+            avg_time = format_seconds(hours.mean * 3600)
+            std_time = format_seconds(hours.std * 3600) if hours.n > 1 else None
+            time_data[agent_key] = {
+                "hours": parse_time_to_hours(avg_time),
+                "time": format_time_display(avg_time),
+                "stdHours": parse_time_to_hours(std_time) if std_time else None,
+                "stdTime": format_time_display(std_time) if std_time else None,
+                "n": int(hours.n)
+            }
+
+
+def load_time_seconds(registry):
+    # Unrounded (avg, std) seconds per agent, for outputs that print times to
+    # the second. Read from data/ even when timeData itself was reused or came
+    # from the results store, which only keep rounded hours.
+    scores = score_sources(registry)
+    seconds = {}
+    load_time_data(registry["names"], scores, seconds)
+    add_run_time_data({}, scores, seconds)
+    return seconds
+
+
+def agent_key_from_label(label):
+    return AGENT_ALIASES.get(label, label.lower().replace("_", "-").replace(" ", "-"))
+
+
+def parse_run_name(run):
+    # "opencode_anthropic_claude-opus-4-5_10h" -> ("opencode", "opus-4.5")
+    tokens = run.split("_")
+    while len(tokens) > 1 and RUN_TRAILING_TOKEN.match(tokens[-1]):
+        tokens.pop()
+    model = tokens[-1]
+    model = re.sub(r"-\d{4}-\d{2}-\d{2}$", "", model)
+    model = re.sub(r"-free$", "", model)
+    model = re.sub(r"^claude-", "", model)
+    model = re.sub(r"(?<=\d)-(?=\d)", ".", model)
+    return tokens[0], model
+
+
+def scan_data_dir():
+    avg_files, std_files, runs = {}, {}, {}
+    with os.scandir(DATA_DIR) as entries:
+        filenames = sorted(entry.name for entry in entries)
+    for filename in filenames:
+        stem = filename.removesuffix(".csv")
+        if stem == filename or filename in NON_AGENT_FILES:
+            continue
+        for prefix, target, kind in [
+            ("aggregated_avg_", avg_files, None),
+            ("aggregated_std_", std_files, None),
+            ("aggregated_", runs, "aggregated"),
+            ("final_", runs, "final"),
+        ]:
+            if stem.startswith(prefix):
+                label = stem.removeprefix(prefix)
+                if label in IGNORED_LABELS:
+                    pass
+                elif kind is None:
+                    target[label] = filename
+                else:
+                    target.setdefault(label, {})[kind] = filename
+                break
+
+    run_dirs = []
+    if RUNS_DIR.is_dir():
+        with os.scandir(RUNS_DIR) as entries:
+            run_dirs = sorted(entry.name for entry in entries if entry.is_dir())
+
+    # "names" resolves every label used inside the CSVs (single_metrics agent
+    # names, time overview methods) to an agent key.
+    agents, names = {}, {"baseline": AGENT_ALIASES["baseline"]}
+    for label, filename in avg_files.items():
+        agent_key = agent_key_from_label(label)
+        names[label] = agent_key
+        agents[agent_key] = {"avg": filename}
+    for label, filename in std_files.items():
+        agent_key = agent_key_from_label(label)
+        if agent_key in agents:
+            agents[agent_key]["std"] = filename
+    # Per-run results are aggregated here and replace pre-aggregated files.
+    for label in run_dirs:
+        agent_key = agent_key_from_label(label)
+        names[label] = agent_key
+        agents[agent_key] = {"runs": (RUNS_DIR / label).relative_to(DATA_DIR).as_posix()}
+
+    native_keys = set(agents)
+    for run, files in runs.items():
+        harness, model = parse_run_name(run)
+        if run in AGENT_ALIASES:
+            agent_key = AGENT_ALIASES[run]
+        elif harness == "opencode" and model in native_keys:
+            agent_key = f"{model}-opencode"
+        else:
+            agent_key = model
+        names[run] = agent_key
+        # Averaged runs take precedence over any single run of the same agent.
+        if agent_key not in native_keys:
+            agents[agent_key] = files
+
+    return {"files": filenames, "agents": agents, "names": names}
+
+
+def load_registry():
+    # The index only depends on file names, so it stays valid for as long as
+    # the directory's mtime (bumped on create/delete/rename) and this script
+    # are unchanged. A warm run costs one stat of data/ instead of a listing.
+    # Files inside each run directory are listed when the sources are built.
+    key = {
+        "data_dir": str(DATA_DIR.resolve()),
+        "mtime_ns": DATA_DIR.stat().st_mtime_ns,
+        "runs_mtime_ns": RUNS_DIR.stat().st_mtime_ns if RUNS_DIR.is_dir() else None,
+        "script": file_digest(Path(__file__).resolve())["sha256"],
+    }
+    if REGISTRY_CACHE_FILE.exists():
+        try:
+            cached = read_json(REGISTRY_CACHE_FILE)
+        except json.JSONDecodeError:
+            cached = {}
+        if cached.get("key") == key:
+            return cached["index"]
+
+    index = scan_data_dir()
+    REGISTRY_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with open(REGISTRY_CACHE_FILE, 'w') as f:
+        json.dump({"key": key, "index": index}, f, indent=2)
+    return index
+
+
+# Each source maps an agent key to (loader, input files). The loader is only
+# called with those files and returns that agent's slice of the ScoreTensor,
+# which is what lets --incremental skip agents whose inputs are unchanged.
+def score_sources(registry):
+    baseline_file = DATA_DIR / "aggregated_baseline.csv"
+    sources = {
+        "base-model": (load_scores, [baseline_file]),
+        "base-model-fewshot": (load_scores, [DATA_DIR / "aggregated_baseline_fewshot.csv"]),
+        "human": (lambda f: load_scores(f, HUMAN_MODELS), [baseline_file]),
+    }
+
+    for agent_key, files in registry["agents"].items():
+        if "runs" in files:
+            sources[agent_key] = (load_run_scores, run_inputs(DATA_DIR / files["runs"]))
+        elif "avg" in files:
+            sources[agent_key] = (load_scores, [DATA_DIR / files["avg"]])
+        elif "aggregated" in files and "final" in files:
+            sources[agent_key] = (load_merged_scores, [DATA_DIR / files["aggregated"], DATA_DIR / files["final"]])
+        elif "final" in files:
+            sources[agent_key] = (load_scores, [DATA_DIR / files["final"]])
+
+    return sources
+
+
+def std_sources(registry):
+    sources = {}
+    for agent_key, files in registry["agents"].items():
+        if "runs" in files:
+            sources[agent_key] = (load_run_std, run_inputs(DATA_DIR / files["runs"]))
+        elif "std" in files:
+            sources[agent_key] = (load_std, [DATA_DIR / files["std"]])
+    return sources
+
+
+def stored_scores(values, fallback, *files):
+    return values, fallback
+
+
+def stored_std(std, *files):
+    return std
+
+
+def store_sources(store_file):
+    # score_sources/std_sources served from results_store.py's database, plus
+    # the aggregatedScores and timeData entries it holds. The store is
+    # re-ingested first if data/ changed since it was written.
+    import results_store
+    with contextlib.closing(results_store.open_store(store_file)) as conn:
+        matrices = results_store.agent_matrices(conn, BASE_MODELS, BENCHMARKS)
+        stored = {"aggregatedScores": results_store.agent_scores(conn), "timeData": results_store.agent_times(conn)}
+    scores = {
+        agent_key: (functools.partial(stored_scores, values, fallback), [store_file])
+        for agent_key, (values, fallback, _) in matrices.items()
+    }
+    stds = {
+        agent_key: (functools.partial(stored_std, std), [store_file])
+        for agent_key, (_, _, std) in matrices.items()
+        if std is not None
+    }
+    return scores, stds, stored
+
+
+def file_digest(filepath, previous=None):
+    stat = filepath.stat()
+    if previous and previous["size"] == stat.st_size and previous["mtime_ns"] == stat.st_mtime_ns:
+        return previous
+    # Shared with the parsed CSV cache, which keys its entries by the same hash
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": content_hash(filepath)}
+
+
+def read_manifest():
+    if not MANIFEST_FILE.exists():
+        return {}
+    try:
+        return read_json(MANIFEST_FILE)
+    except json.JSONDecodeError:
+        return {}
+
+
+def write_manifest(manifest):
+    MANIFEST_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with open(MANIFEST_FILE, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+
+def load_previous_build(manifest):
+    # The cached tensor and the previous scores.json are only trusted if they
+    # are exactly the files the manifest describes and were produced by the
+    # same version of this script.
+    if manifest.get("script") != file_digest(Path(__file__).resolve())["sha256"]:
+        return None, None
+    for key, filepath in [("output", OUTPUT_FILE), ("tensor", TENSOR_CACHE_FILE)]:
+        if key not in manifest or not filepath.exists():
+            return None, None
+        if file_digest(filepath, manifest[key])["sha256"] != manifest[key]["sha256"]:
+            return None, None
+    return ScoreTensor.load(TENSOR_CACHE_FILE), read_json(OUTPUT_FILE)
+
+
+def is_stale(files, changed):
+    return bool(changed.intersection(map(str, files)))
+
+
+def source_layout(scores, stds, registry):
+    # Which files each agent is built from, and how CSV labels map to agents.
+    # An agent whose file list differs from the previous build's is rebuilt
+    # even if every file it now reads is unchanged (e.g. its aggregated_avg_*
+    # file was deleted and it now resolves to an opencode pair).
+    return {
+        "scores": {agent_key: [str(f) for f in files] for agent_key, (_, files) in scores.items()},
+        "std": {agent_key: [str(f) for f in files] for agent_key, (_, files) in stds.items()},
+        "names": registry["names"] if registry is not None else None,
+    }
+
+
+def moved_agents(layout, previous_layout):
+    # Agents whose score or std file list is not the one they were last built from
+    if not previous_layout:
+        return set(layout["scores"])
+    return {agent_key for agent_key in layout["scores"]
+            if any(layout[kind].get(agent_key) != previous_layout.get(kind, {}).get(agent_key) for kind in ("scores", "std"))}
+
+
+def build_tensor(scores, stds, previous=None, changed=frozenset(), profile=None, moved=frozenset()):
+    profile = profile or BuildProfile()
+    tensor = ScoreTensor.empty(scores)
+    rebuilt = []
+    for a, (agent_key, (loader, files)) in enumerate(scores.items()):
+        p = previous.agents.index(agent_key) if previous is not None and agent_key in previous.agents else None
+        if p is not None and agent_key in moved:
+            p = None
+        if p is not None and not is_stale(files, changed):
+            tensor.values[a] = previous.values[p]
+            tensor.fallback[a] = previous.fallback[p]
+        else:
+            with profile.parse(files):
+                tensor.values[a], tensor.fallback[a] = loader(*files)
+            rebuilt.append(agent_key)
+
+        if agent_key in stds:
+            loader, files = stds[agent_key]
+            if p is not None and previous.has_std[p] and not is_stale(files, changed):
+                tensor.std[a] = previous.std[p]
+            else:
+                with profile.parse(files):
+                    tensor.std[a] = loader(*files)
+            tensor.has_std[a] = True
+    return tensor, rebuilt
+
+
+def agent_score_data(tensor, a):
+    values = tensor.values[a].tolist()
+    codes = tensor.fallback[a].tolist()
+    return {
+        model: {
+            bm: {"value": values[m][b], "fallbackType": FALLBACK_TYPES[codes[m][b]]}
+            for b, bm in enumerate(BENCHMARKS)
+        }
+        for m, model in enumerate(BASE_MODELS)
+    }
+
+
+def agent_std_data(tensor, a):
+    if not tensor.has_std[a]:
+        return None
+    std = tensor.std[a].tolist()
+    return {model: dict(zip(BENCHMARKS, std[m])) for m, model in enumerate(BASE_MODELS)}
+
+
+# modelBenchmarkData and stdData are built one agent at a time while scores.json
+# is written (see iter_scores_json), so only one agent's dicts exist at once
+def iter_model_benchmark_data(tensor):
+    for a, agent_key in enumerate(tensor.agents):
+        yield agent_key, agent_score_data(tensor, a)
+
+
+def iter_std_data(tensor):
+    for a, agent_key in enumerate(tensor.agents):
+        if tensor.has_std[a]:
+            yield agent_key, agent_std_data(tensor, a)
+
+
+def fallback_counts(tensor):
+    # Cells per agent filled with the base model's score, by reason; agents
+    # without fallbacks are left out
+    counts = np.stack([(tensor.fallback == code).sum(axis=(1, 2)) for code in range(len(FALLBACK_TYPES))], axis=1)
+    return {
+        agent_key: {FALLBACK_TYPES[code]: int(n) for code, n in enumerate(row) if code and n}
+        for agent_key, row in zip(tensor.agents, counts.tolist())
+        if any(row[1:])
+    }
+
+
+def print_fallback_warnings(counts):
+    cells = len(BASE_MODELS) * len(BENCHMARKS)
+    for agent_key, reasons in counts.items():
+        total = sum(reasons.values())
+        if total >= FALLBACK_WARNING_SHARE * cells:
+            details = ", ".join(f"{n} {reason.replace('_', ' ')}" for reason, n in reasons.items())
+            print(f"Warning: {agent_key} uses base model scores for {total}/{cells} cells ({details})")
+
+
+def mark_pareto_frontier(time_data, tensor, aggregates, aggregated_scores):
+    # An agent is on the frontier if no other agent is both faster and better
+    # on the leaderboard average. Baselines are not candidates.
+    candidates = [key for key in time_data if key in tensor.agents and key not in BASELINE_KEYS]
+    points = np.array([
+        [
+            time_data[key]["hours"],
+            aggregated_scores[key]["avg"] if key in aggregated_scores
+            else aggregates["overall"][tensor.agents.index(key)],
+        ]
+        for key in candidates
+    ]).reshape(-1, 2)
+    frontier = {key for key, on_front in zip(candidates, pareto_mask(points, maximize=[False, True])) if on_front}
+    for key, entry in time_data.items():
+        entry["paretoFrontier"] = key in frontier
+
+
+def bootstrap_agent(values, std, run_std, n, weights, resamples, seed):
+    # Parametric bootstrap of the weighted score. Only each cell's mean and
+    # std are known, so every resample draws n runs per (base_model,
+    # benchmark) cell from Normal(mean, std) and averages the runs' weighted
+    # scores. Cells are drawn independently, which understates how much a
+    # whole run varies, so deviations are rescaled to the run-level std that
+    # single_metrics_aggregated.csv reports.
+    rng = np.random.default_rng(seed)
+    center = (values @ weights).mean()
+    independent_std = np.sqrt(((std ** 2) @ (weights ** 2)).sum()) / len(values)
+    scale = run_std / independent_std if independent_std > 0 else 0.0
+    chunk = max(1, BOOTSTRAP_CHUNK // (n * values.size))
+    scores = []
+    for start in range(0, resamples, chunk):
+        size = min(chunk, resamples - start)
+        runs = rng.normal(values, std, size=(size, n) + values.shape)
+        scores.append(center + ((runs @ weights).mean(axis=(1, 2)) - center) * scale)
+    alpha = (1 - CI_LEVEL) / 2
+    return np.quantile(np.concatenate(scores), [alpha, 1 - alpha])
+
+
+def bootstrap_intervals(tensor, weights, aggregated_scores, resamples, jobs=1):
+    # Each agent gets its own generator seeded from its key, so intervals do
+    # not depend on agent order or on how agents are spread over workers.
+    w = np.array([weights[bm] for bm in BENCHMARKS])
+    tasks = {
+        agent_key: (tensor.values[a], tensor.std[a], aggregated_scores[agent_key]["std"],
+                    aggregated_scores[agent_key]["n"], w, resamples, [BOOTSTRAP_SEED, zlib.crc32(agent_key.encode())])
+        for a, agent_key in enumerate(tensor.agents)
+        if agent_key in aggregated_scores and tensor.has_std[a] and aggregated_scores[agent_key]["n"] > 1
+    }
+    if jobs > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(tasks))) as pool:
+            intervals = pool.map(bootstrap_agent, *zip(*tasks.values()))
+            return dict(zip(tasks, intervals))
+    return {agent_key: bootstrap_agent(*args) for agent_key, args in tasks.items()}
+
+
+def permutation_pvalues(diffs, permutations, seed):
+    # Paired sign-flip test on a (cell, pair) array of differences. If two
+    # agents are interchangeable, each cell's difference is as likely to be
+    # negative as positive. Every chunk of pairs regenerates the same sign
+    # patterns from the seed.
+    rng = np.random.default_rng(seed)
+    signs = rng.integers(0, 2, size=(permutations, len(diffs))) * 2.0 - 1
+    observed = np.abs(diffs.sum(axis=0))
+    extreme = (np.abs(signs @ diffs) >= observed - 1e-9).sum(axis=0)
+    return (extreme + 1) / (permutations + 1)
+
+
+def significance_matrix(tensor, weights, permutations, jobs=1):
+    # Two-sided p-values for "agents i and j have the same weighted score",
+    # paired over the (base_model, benchmark) cells, each weighted as in the
+    # overall score. Only the upper triangle (i < j) is stored, row by row.
+    w = np.array([weights[bm] for bm in BENCHMARKS])
+    cells = (tensor.values * w / len(BASE_MODELS)).reshape(len(tensor.agents), -1)
+    first, second = np.triu_indices(len(tensor.agents), k=1)
+    chunk = max(1, min(SIGNIFICANCE_CHUNK // permutations, -(-len(first) // max(jobs, 1))))
+    diffs = [(cells[first[s:s + chunk]] - cells[second[s:s + chunk]]).T for s in range(0, len(first), chunk)]
+
+    if jobs > 1 and len(diffs) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(diffs))) as pool:
+            pvalues = list(pool.map(permutation_pvalues, diffs, repeat(permutations), repeat(SIGNIFICANCE_SEED)))
+    else:
+        pvalues = [permutation_pvalues(d, permutations, SIGNIFICANCE_SEED) for d in diffs]
+    pvalues = np.concatenate(pvalues) if pvalues else np.zeros(0)
+    return {
+        "agents": tensor.agents,
+        "permutations": permutations,
+        "pValues": np.round(pvalues, 4).tolist(),
+    }
+
+
+def rank_counts(benchmark_scores, alpha, samples, seed):
+    # (agent, rank) histogram over `samples` Dirichlet weight vectors: one
+    # matrix product scores every agent under every sample, one argsort per
+    # row ranks them.
+    rng = np.random.default_rng(seed)
+    n = len(benchmark_scores)
+    weights = rng.dirichlet(alpha, samples).astype(np.float32)
+    order = np.argsort(-(weights @ benchmark_scores.T), axis=1)
+    return np.bincount((order * n + np.arange(n)).ravel(), minlength=n * n).reshape(n, n)
+
+
+def weight_sensitivity(tensor, weights, samples, jobs=1):
+    # How stable each agent's leaderboard rank is when the benchmark weights
+    # move around factors.json. Baselines are not ranked.
+    agents = [agent_key for agent_key in tensor.agents if agent_key not in BASELINE_KEYS]
+    rows = [tensor.agents.index(agent_key) for agent_key in agents]
+    benchmark_scores = tensor.values[rows].mean(axis=1)
+    w = np.array([weights[bm] for bm in BENCHMARKS])
+    alpha = w / w.sum() * WEIGHT_CONCENTRATION
+
+    sizes = [min(WEIGHT_SAMPLE_CHUNK, samples - start) for start in range(0, samples, WEIGHT_SAMPLE_CHUNK)]
+    seeds = np.random.SeedSequence(WEIGHT_SENSITIVITY_SEED).spawn(len(sizes))
+    args = (repeat(benchmark_scores.astype(np.float32)), repeat(alpha), sizes, seeds)
+    if jobs > 1 and len(sizes) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(sizes))) as pool:
+            counts = sum(pool.map(rank_counts, *args))
+    else:
+        counts = sum(map(rank_counts, *args))
+
+    ranks = np.arange(1, len(agents) + 1)
+    base_ranks = np.empty(len(agents), dtype=int)
+    base_ranks[np.argsort(-(benchmark_scores @ w), kind="stable")] = ranks
+    result = {}
+    for a, agent_key in enumerate(agents):
+        cdf = np.cumsum(counts[a]) / samples
+        result[agent_key] = {
+            "baseRank": int(base_ranks[a]),
+            "meanRank": round(float(counts[a] @ ranks) / samples, 2),
+            "rankInterval": [int(ranks[np.searchsorted(cdf, 0.05)]), int(ranks[np.searchsorted(cdf, 0.95)])],
+            "rankCounts": {str(rank): int(count) for rank, count in zip(ranks, counts[a]) if count},
+        }
+    return {"samples": samples, "concentration": WEIGHT_CONCENTRATION, "agents": result}
+
+
+def print_weight_sensitivity(sensitivity):
+    print(f"Rank stability over {sensitivity['samples']} weight samples:")
+    rows = sorted(sensitivity["agents"].items(), key=lambda item: item[1]["baseRank"])
+    for agent_key, entry in rows:
+        low, high = entry["rankInterval"]
+        held = entry["rankCounts"].get(str(entry["baseRank"]), 0) / sensitivity["samples"]
+        print(f"  {entry['baseRank']:>3d}  {agent_key:28s} mean {entry['meanRank']:6.2f}  "
+              f"90% {low:>3d}-{high:<3d}  holds rank {held:6.1%}")
+
+
+def to_fixed(val, digits=2):
+    # Matches JavaScript's Number.prototype.toFixed (round half up on the
+    # exact binary value), which the page used to format these numbers.
+    return str(Decimal(float(val)).quantize(Decimal(1).scaleb(-digits), rounding=ROUND_HALF_UP))
+
+
+def compute_aggregates(tensor, weights):
+    # One pass over the tensor for what data.js used to compute per agent in
+    # calculateWeightedAverage, calculateWeightedAverageForModel,
+    # calculateWeightedAverageStd and getAverageBenchmarkScores.
+    w = np.array([weights[bm] for bm in BENCHMARKS])
+    per_model = tensor.values @ w
+    return {
+        "per_model": per_model,
+        "overall": per_model.mean(axis=1),
+        "overall_std": np.sqrt(((tensor.std ** 2) @ (w ** 2)).mean(axis=1)),
+        "benchmark_values": tensor.values.mean(axis=1),
+        "benchmark_stds": tensor.std.mean(axis=1),
+    }
+
+
+def overall_scores(tensor, aggregates, aggregated_scores):
+    # (score, std) per agent as the leaderboard ranks it: the run-level numbers
+    # in aggregatedScores where there are any, otherwise the tensor's
+    scores = []
+    for a, agent_key in enumerate(tensor.agents):
+        if agent_key in aggregated_scores:
+            scores.append((aggregated_scores[agent_key]["avg"], aggregated_scores[agent_key]["std"]))
+        else:
+            scores.append((aggregates["overall"][a], aggregates["overall_std"][a] if tensor.has_std[a] else None))
+    return scores
+
+
+def leaderboard_views(tensor, aggregates, aggregated_scores):
+    # Ready-to-render rows for the "average" view and each base model, sorted
+    # by score. Scores are formatted like the page formats them; ranks are
+    # left to the page since they depend on which agents it shows.
+    overall = []
+    for a, (score, std) in enumerate(overall_scores(tensor, aggregates, aggregated_scores)):
+        agent_key = tensor.agents[a]
+        overall.append((score, {
+            "agentKey": agent_key,
+            "averageScore": to_fixed(score),
+            "stdDev": to_fixed(std) if std is not None else None,
+            "benchmarkScores": {
+                bm: {
+                    "value": to_fixed(aggregates["benchmark_values"][a, b]),
+                    "std": to_fixed(aggregates["benchmark_stds"][a, b]) if tensor.has_std[a] else None,
+                }
+                for b, bm in enumerate(BENCHMARKS)
+            },
+        }))
+
+    views = {"average": overall}
+    for m, model in enumerate(BASE_MODELS):
+        views[model] = [
+            (score, {"agentKey": agent_key, "averageScore": to_fixed(score)})
+            for agent_key, score in zip(tensor.agents, aggregates["per_model"][:, m])
+        ]
+    return {
+        view: [entry for _, entry in sorted(rows, key=lambda row: -row[0])]
+        for view, rows in views.items()
+    }
+
+
+# Members of scores.json that are not in `output` but encoded from the tensor
+# while the file is written, each right after the member named here
+STREAMED_MEMBERS = {
+    "benchmarkWeights": ("modelBenchmarkData", iter_model_benchmark_data),
+    "aggregatedScores": ("stdData", iter_std_data),
+}
+
+
+def indented_json(value, level):
+    # json.dumps(value, indent=2) as nested `level` deep; strings in JSON never
+    # hold a raw newline, so re-indenting the text is safe
+    return json.dumps(value, indent=2).replace("\n", "\n" + "  " * level)
+
+
+def iter_streamed_object(pairs, level):
+    empty = True
+    for key, value in pairs:
+        yield ("{\n" if empty else ",\n") + "  " * (level + 1) + f"{json.dumps(key)}: {indented_json(value, level + 1)}"
+        empty = False
+    yield "{}" if empty else "\n" + "  " * level + "}"
+
+
+def iter_scores_json(output, tensor):
+    # scores.json exactly as json.dumps(..., indent=2) would write it with the
+    # streamed members in place, one member (and one agent) at a time
+    members = []
+    for name, value in output.items():
+        members.append((name, [indented_json(value, 1)]))
+        if name in STREAMED_MEMBERS:
+            streamed_name, produce = STREAMED_MEMBERS[name]
+            members.append((streamed_name, iter_streamed_object(produce(tensor), 1)))
+    for i, (name, chunks) in enumerate(members):
+        yield ("{\n" if i == 0 else ",\n") + f"  {json.dumps(name)}: "
+        yield from chunks
+    yield "\n}" if members else "{}"
+
+
+def batched_text(chunks, size=WRITE_BUFFER_SIZE):
+    buffer, buffered = [], 0
+    for chunk in chunks:
+        buffer.append(chunk)
+        buffered += len(chunk)
+        if buffered >= size:
+            yield "".join(buffer)
+            buffer, buffered = [], 0
+    if buffer:
+        yield "".join(buffer)
+
+
+def write_if_changed(filepath, chunks):
+    # Chunks go to a temporary file next to filepath, which is renamed over it
+    # only if the content differs, so readers never see a partial file
+    if isinstance(chunks, str):
+        chunks = [chunks]
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = filepath.with_name(f".{filepath.name}.{os.getpid()}.tmp")
+    digest = hashlib.sha256()
+    try:
+        with open(tmp_file, 'w') as f:
+            for chunk in batched_text(chunks):
+                f.write(chunk)
+                digest.update(chunk.encode())
+        if filepath.exists() and file_digest(filepath)["sha256"] == digest.hexdigest():
+            tmp_file.unlink()
+            return False
+        os.replace(tmp_file, filepath)
+    except BaseException:
+        tmp_file.unlink(missing_ok=True)
+        raise
+    return True
+
+
+def write_shards(shard_dir, output, tensor):
+    # One file per agent with everything only needed for its detail views,
+    # plus a manifest with what the leaderboard needs to render.
+    agents_dir = shard_dir / "agents"
+    agents = {}
+    written = 0
+    for a, agent_key in enumerate(tensor.agents):
+        shard = {
+            "modelBenchmarkData": agent_score_data(tensor, a),
+            "stdData": agent_std_data(tensor, a),
+            "timeData": output["timeData"].get(agent_key),
+        }
+        text = json.dumps(shard, separators=(",", ":"))
+        shard_file = agents_dir / f"{agent_key}.json"
+        written += write_if_changed(shard_file, text)
+        agents[agent_key] = {
+            "shard": shard_file.relative_to(shard_dir).as_posix(),
+            "sha256": hashlib.sha256(text.encode()).hexdigest()[:16],
+        }
+
+    if agents_dir.exists():
+        for stale in agents_dir.glob("*.json"):
+            if stale.stem not in agents:
+                stale.unlink()
+                written += 1
+
+    manifest = {
+        "benchmarkWeights": output["benchmarkWeights"],
+        "baseModels": BASE_MODELS,
+        "aggregatedScores": output["aggregatedScores"],
+        "leaderboardViews": output["leaderboardViews"],
+        "agents": agents,
+    }
+    written += write_if_changed(shard_dir / "manifest.json", json.dumps(manifest, separators=(",", ":")))
+    return written
+
+
+def pack_array(array, dtype):
+    return base64.b64encode(np.ascontiguousarray(array, dtype=dtype).tobytes()).decode("ascii")
+
+
+def compact_output(output, tensor):
+    # Dimension names are stored once; "scores" and "std" are little-endian
+    # float32 and "fallback" is uint8, all flattened in (agent, base_model,
+    # benchmark) order. std is NaN for agents without std data. leaderboardViews
+    # are left out: they are formatted strings that a reader rebuilds from
+    # these arrays, and would be about half the file.
+    compact = {
+        "format": "compact-v1",
+        "benchmarkWeights": output["benchmarkWeights"],
+        "agents": tensor.agents,
+        "baseModels": BASE_MODELS,
+        "benchmarks": BENCHMARKS,
+        "fallbackTypes": FALLBACK_TYPES,
+        "scores": pack_array(tensor.values, "<f4"),
+        "std": pack_array(tensor.std, "<f4"),
+        "fallback": pack_array(tensor.fallback, "u1"),
+        "aggregatedScores": output["aggregatedScores"],
+        "timeData": output["timeData"],
+        "fallbackCounts": output["fallbackCounts"],
+    }
+    for key in ["significance", "weightSensitivity"]:
+        if key in output:
+            compact[key] = output[key]
+    return compact
+
+
+class BuildProfile:
+    # Wall time and peak traced memory (tracemalloc) per stage of
+    # generate_scores_json, plus parse time per input. Disabled, every method
+    # is a no-op, so the build can always go through one.
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.stages = {}
+        self.files = {}
+        self.start = time.perf_counter()
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        if not self.enabled:
+            yield
+            return
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            current, peak = tracemalloc.get_traced_memory()
+            self.stages[name] = {
+                "seconds": round(time.perf_counter() - start, 6),
+                "peakBytes": peak,
+                "retainedBytes": current - before,
+            }
+
+    @contextlib.contextmanager
+    def parse(self, files):
+        # Files read together by one loader (e.g. aggregated_* + final_*) share an entry
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            key = ", ".join(str(f) for f in files)
+            self.files[key] = round(self.files.get(key, 0) + time.perf_counter() - start, 6)
+
+    def report(self):
+        return {
+            "python": sys.version.split()[0],
+            "numpy": np.__version__,
+            "totalSeconds": round(time.perf_counter() - self.start, 6),
+            "peakBytes": max((stage["peakBytes"] for stage in self.stages.values()), default=0),
+            "stages": self.stages,
+            "files": dict(sorted(self.files.items(), key=lambda item: -item[1])),
+        }
+
+    def print_summary(self):
+        print(f"{'stage':24s}{'seconds':>10s}{'peak MiB':>10s}")
+        for name, stage in self.stages.items():
+            print(f"{name:24s}{stage['seconds']:10.4f}{stage['peakBytes'] / 2**20:10.2f}")
+        slowest = list(self.report()["files"].items())[:5]
+        if slowest:
+            print("Slowest inputs:")
+            for files, seconds in slowest:
+                print(f"  {seconds:8.4f}s  {files}")
+
+
+def generate_scores_json(incremental=False, shard_dir=None, compact_file=None, bootstrap=None, significance=None,
+                         sensitivity=None, jobs=1, profile=None, store_file=None, paper_dir=None):
+    profile = profile or BuildProfile()
+    # Run inputs are cached by file name, which only holds within one build
+    ingest_runs.cache_clear()
+    factors_file = DATA_DIR / "factors.json"
+    aggregated_file = DATA_DIR / "single_metrics_aggregated.csv"
+    time_files = [DATA_DIR / "time_aggregated.csv", DATA_DIR / "aggregated_time_overview.csv"]
+    with profile.stage("registry"):
+        if store_file is None:
+            registry = load_registry()
+            scores = score_sources(registry)
+            stds = std_sources(registry)
+            stored = None
+        else:
+            registry = None
+            scores, stds, stored = store_sources(store_file)
+            # Everything but factors.json then comes from the store
+            aggregated_file, time_files = store_file, [store_file]
+
+    with profile.stage("input hashes"):
+        inputs = {factors_file}
+        for _, files in list(scores.values()) + list(stds.values()):
+            inputs.update(files)
+        if registry is not None:
+            inputs.update(f for f in [aggregated_file] + time_files if f.name in registry["files"])
+
+        manifest = read_manifest() if incremental else {}
+        previous_inputs = manifest.get("inputs", {})
+        digests = {str(f): file_digest(f, previous_inputs.get(str(f))) for f in sorted(inputs)}
+        changed = {path for path, digest in digests.items() if previous_inputs.get(path, {}).get("sha256") != digest["sha256"]}
+        changed.update(set(previous_inputs) - set(digests))
+
+        layout = source_layout(scores, stds, registry)
+        moved = moved_agents(layout, manifest.get("layout"))
+        previous_tensor, previous = load_previous_build(manifest) if incremental else (None, None)
+        if previous is None:
+            previous = {}
+        # aggregatedScores and timeData are keyed by agent through the same
+        # mapping, so they are only reused if it is unchanged as a whole
+        if layout != manifest.get("layout"):
+            previous.pop("aggregatedScores", None)
+            previous.pop("timeData", None)
+
+    # Baselines, agent averages, opencode/qwen3max/sonnet merges and stds all
+    # come from score_sources/std_sources; per-file times are in profile.files
+    with profile.stage("scores and std"):
+        tensor, rebuilt = build_tensor(scores, stds, previous_tensor, changed, profile, moved)
+
+    # Removed runs change the source layout, which already drops the reuse
+    run_files = [f for loader, files in scores.values() if loader is load_run_scores for f in files]
+    with profile.stage("aggregated scores"):
+        if "aggregatedScores" in previous and not is_stale([aggregated_file] + run_files, changed):
+            aggregated_scores = previous["aggregatedScores"]
+        elif stored is not None:
+            aggregated_scores = stored["aggregatedScores"]
+        else:
+            with profile.parse([aggregated_file]):
+                aggregated_scores = load_aggregated_scores(aggregated_file, registry["names"], scores) if str(aggregated_file) in digests else {}
+            add_run_aggregated_scores(aggregated_scores, scores)
+
+    with profile.stage("time data"):
+        if "timeData" in previous and not is_stale(time_files + run_files, changed):
+            time_data = previous["timeData"]
+        elif stored is not None:
+            time_data = stored["timeData"]
+        else:
+            with profile.parse(time_files):
+                time_data = load_time_data(registry["names"], scores)
+            add_run_time_data(time_data, scores)
+
+    with profile.stage("aggregates"):
+        weights = read_json(factors_file)
+        aggregates = compute_aggregates(tensor, weights)
+        mark_pareto_frontier(time_data, tensor, aggregates, aggregated_scores)
+
+        # Entries reused by --incremental may carry intervals from an earlier run
+        for entry in aggregated_scores.values():
+            entry.pop("ciLow", None)
+            entry.pop("ciHigh", None)
+
+    if bootstrap:
+        with profile.stage("bootstrap"):
+            for agent_key, (low, high) in bootstrap_intervals(tensor, weights, aggregated_scores, bootstrap, jobs).items():
+                aggregated_scores[agent_key]["ciLow"] = float(np.round(low, 2))
+                aggregated_scores[agent_key]["ciHigh"] = float(np.round(high, 2))
+
+    with profile.stage("leaderboard views"):
+        output = {
+            # modelBenchmarkData and stdData are added by iter_scores_json
+            "benchmarkWeights": weights,
+            "aggregatedScores": aggregated_scores,
+            "timeData": time_data,
+            "leaderboardViews": leaderboard_views(tensor, aggregates, aggregated_scores),
+            "fallbackCounts": fallback_counts(tensor),
+        }
+        print_fallback_warnings(output["fallbackCounts"])
+    if significance:
+        with profile.stage("significance"):
+            output["significance"] = significance_matrix(tensor, weights, significance, jobs)
+    if sensitivity:
+        with profile.stage("weight sensitivity"):
+            output["weightSensitivity"] = weight_sensitivity(tensor, weights, sensitivity, jobs)
+        print_weight_sensitivity(output["weightSensitivity"])
+
+    with profile.stage("serialization"):
+        # Every output is derived from the finished model, so the writers run side
+        # by side; each returns what it wrote (True or a file count)
+        writers = {OUTPUT_FILE: lambda: write_if_changed(OUTPUT_FILE, iter_scores_json(output, tensor))}
+        if shard_dir is not None:
+            writers[shard_dir] = lambda: write_shards(shard_dir, output, tensor)
+        if compact_file is not None:
+            writers[compact_file] = lambda: write_if_changed(
+                compact_file, json.dumps(compact_output(output, tensor), separators=(",", ":")))
+        paper_files = []
+        if paper_dir is not None:
+            import paper_export
+            time_seconds = load_time_seconds(registry if registry is not None else load_registry())
+            paper_writers = paper_export.writers(output, tensor, aggregates, time_seconds, paper_dir)
+            paper_files = list(paper_writers)
+            writers.update(paper_writers)
+        with ThreadPoolExecutor(max_workers=len(writers)) as pool:
+            futures = {target: pool.submit(writer) for target, writer in writers.items()}
+            results = {target: future.result() for target, future in futures.items()}
+        written = sum(results.values())
+
+    if incremental:
+        with profile.stage("build cache"):
+            TENSOR_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+            tensor.save(TENSOR_CACHE_FILE)
+            write_manifest({
+                "script": file_digest(Path(__file__).resolve())["sha256"],
+                "inputs": digests,
+                "layout": layout,
+                "output": file_digest(OUTPUT_FILE),
+                "tensor": file_digest(TENSOR_CACHE_FILE),
+            })
+        print(f"Rebuilt {len(rebuilt)} agent(s) from {len(changed)} changed input(s)")
+
+    if not written:
+        print(f"{OUTPUT_FILE} is up to date")
+        return
+    print(f"Generated {OUTPUT_FILE}")
+    if shard_dir is not None:
+        print(f"Generated {shard_dir / 'manifest.json'} and {len(tensor.agents)} agent shards")
+    if compact_file is not None:
+        print(f"Generated {compact_file}")
+    for paper_file in paper_files:
+        print(f"Generated {paper_file}" if results[paper_file] else f"{paper_file} is up to date")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate scores.json from the CSVs in data/")
+    parser.add_argument("--incremental", action="store_true",
+                        help="only re-parse inputs whose content hash changed since the last run")
+    parser.add_argument("--shard", nargs="?", const="scores", metavar="DIR",
+                        help="also write DIR/manifest.json plus one file per agent for lazy loading (default DIR: scores)")
+    parser.add_argument("--compact", nargs="?", const="scores.compact.json", metavar="FILE",
+                        help="also write a compact export with packed float32 arrays (default FILE: scores.compact.json)")
+    parser.add_argument("--paper", nargs="?", const="paper-plots", metavar="DIR",
+                        help="also write the paper's fig1/fig2 CSVs and refresh its LaTeX tables in DIR (default DIR: paper-plots)")
+    parser.add_argument("--bootstrap", nargs="?", type=int, const=10000, metavar="N",
+                        help=f"add {CI_LEVEL:.0%} bootstrap confidence intervals to aggregatedScores, from N resamples (default N: 10000)")
+    parser.add_argument("--significance", nargs="?", type=int, const=10000, metavar="N",
+                        help="add pairwise permutation-test p-values between agents, from N permutations (default N: 10000)")
+    parser.add_argument("--weight-sensitivity", nargs="?", type=int, const=1000000, metavar="N",
+                        help="re-rank agents under N weight vectors drawn around factors.json and report rank stability (default N: 1000000)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(),
+                        help="worker processes for --bootstrap, --significance and --weight-sensitivity (default: all cores)")
+    parser.add_argument("--profile", nargs="?", const=str(PROFILE_FILE), metavar="FILE",
+                        help=f"time each stage, track peak memory and write a JSON report to FILE (default FILE: {PROFILE_FILE})")
+    parser.add_argument("--store", nargs="?", const=str(RESULTS_STORE_FILE), metavar="FILE",
+                        help=f"read scores, stds and times from the results_store.py database instead of the CSVs, "
+                             f"re-ingesting it if data/ changed (default FILE: {RESULTS_STORE_FILE})")
+    parser.add_argument("--pstats", metavar="FILE",
+                        help="also run under cProfile and dump the stats to FILE (read with python -m pstats FILE)")
+    args = parser.parse_args()
+
+    os.chdir(Path(__file__).parent)
+    profile = BuildProfile(enabled=bool(args.profile))
+    profiler = cProfile.Profile() if args.pstats else None
+    if profile.enabled:
+        tracemalloc.start()
+    if profiler is not None:
+        profiler.enable()
+    generate_scores_json(
+        incremental=args.incremental,
+        shard_dir=Path(args.shard) if args.shard else None,
+        compact_file=Path(args.compact) if args.compact else None,
+        store_file=Path(args.store) if args.store else None,
+        paper_dir=Path(args.paper) if args.paper else None,
+        bootstrap=args.bootstrap,
+        significance=args.significance,
+        sensitivity=args.weight_sensitivity,
+        jobs=args.jobs,
+        profile=profile,
+    )
+    if profiler is not None:
+        profiler.disable()
+        profiler.dump_stats(args.pstats)
+        print(f"Wrote cProfile stats to {args.pstats}")
+    if profile.enabled:
+        tracemalloc.stop()
+        report_file = Path(args.profile)
+        report_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(report_file, 'w') as f:
+            json.dump(profile.report(), f, indent=2)
+        profile.print_summary()
+        print(f"Wrote profile to {report_file}")
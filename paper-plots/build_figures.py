@@ -0,0 +1,124 @@
+"""
+Build all paper figures in parallel
+
+Outputs whose script, helpers, data and matplotlib version are unchanged since
+they were last rendered are skipped (see figure_cache.py); --force redraws them.
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import figure_cache
+
+SCRIPT_DIR = Path(__file__).parent
+FORMATS = ("pdf", "png")
+
+_modules = {}
+
+
+def discover_figures(names: list | None = None) -> list[Path]:
+    scripts = sorted(SCRIPT_DIR.glob("fig[0-9]*.py"))
+    if names:
+        scripts = [s for s in scripts if any(s.stem.startswith(name) for name in names)]
+    return scripts
+
+
+def load_figure_module(script: Path):
+    # Worker processes are reused, so each figure module (and matplotlib,
+    # pandas and the font manager behind it) is only imported once per worker.
+    # A module is re-executed when its file changes; its heavy imports stay cached.
+    mtime = script.stat().st_mtime_ns
+    if script not in _modules or _modules[script][0] != mtime:
+        import matplotlib
+        matplotlib.use("Agg")
+        spec = importlib.util.spec_from_file_location(script.stem, script)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _modules[script] = (mtime, module)
+    return _modules[script][1]
+
+
+def render(script: Path, fmt: str, background: str | None) -> tuple:
+    start = time.perf_counter()
+    log = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(log):
+            module = load_figure_module(script)
+            import matplotlib.pyplot as plt
+            save_path = module.OUTPUT_DIR / script.stem
+            # Workers render several figures, and create_figure() updates
+            # plt.rcParams globally; rc_context restores them afterwards so the
+            # output does not depend on which figure a worker drew before.
+            with plt.rc_context():
+                df = module.load_data(module.DATA_PATH)
+                module.create_figure(
+                    df,
+                    save_path,
+                    background=background or module.BACKGROUND,
+                    formats=(fmt,),
+                )
+            plt.close("all")
+            figure_cache.record(module, (fmt,), save_path, background=background)
+        error = None
+    except Exception:
+        error = traceback.format_exc()
+    return script.stem, fmt, time.perf_counter() - start, error, log.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render paper figures in a process pool")
+    parser.add_argument("figures", nargs="*", help="figure name prefixes, e.g. fig1 fig5a (default: all)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="worker processes (default: all cores)")
+    parser.add_argument("--formats", nargs="+", default=list(FORMATS), help="output formats (default: pdf png)")
+    parser.add_argument("--background", choices=["white", "sepia"], help="override each figure's BACKGROUND")
+    parser.add_argument("--force", action="store_true", help="redraw figures even if they are up to date")
+    parser.add_argument("--verbose", action="store_true", help="print each figure's own output")
+    args = parser.parse_args()
+
+    scripts = discover_figures(args.figures)
+    if not scripts:
+        print("No figures matched")
+        return 1
+
+    # One task per (figure, format), so the formats of a figure are also saved in parallel
+    start = time.perf_counter()
+    results = {}
+    failures = 0
+    tasks = []
+    for script in scripts:
+        for fmt in args.formats:
+            if not args.force and figure_cache.is_fresh(script, fmt, background=args.background):
+                results.setdefault(script.stem, {})[fmt] = "   cached"
+            else:
+                tasks.append((script, fmt))
+
+    with ProcessPoolExecutor(max_workers=min(args.jobs, len(tasks)) or 1) as pool:
+        futures = [pool.submit(render, script, fmt, args.background) for script, fmt in tasks]
+        for future in as_completed(futures):
+            name, fmt, elapsed, error, log = future.result()
+            results.setdefault(name, {})[fmt] = f"{elapsed:8.2f}s" if error is None else "   failed"
+            if args.verbose and log:
+                print(log, end="")
+            if error:
+                failures += 1
+                print(f"FAILED {name}.{fmt} after {elapsed:.2f}s\n{log}{error}")
+    wall = time.perf_counter() - start
+
+    print(f"\n{'figure':32s}" + "".join(f"{fmt:>9s}" for fmt in args.formats))
+    for script in scripts:
+        times = results.get(script.stem, {})
+        print(f"{script.stem:32s}" + "".join(times[fmt] for fmt in args.formats))
+    print(f"\nRendered {len(tasks)} output(s) of {len(scripts)} figure(s) in {wall:.2f}s wall time, {failures} failure(s)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
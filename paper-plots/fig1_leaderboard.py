@@ -7,8 +7,14 @@ import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 import matplotlib.font_manager as fm
 import numpy as np
+import sys
 from pathlib import Path
 
+import figure_cache
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from parsed_cache import read_csv  # noqa: E402
+
 FONT_STYLE = "monospace"
 
 FONT_FALLBACKS = {
@@ -45,7 +51,7 @@ OUTPUT_DIR.mkdir(exist_ok=True)
 
 
 def load_data(filepath: Path) -> pd.DataFrame:
-    df = pd.read_csv(filepath)
+    df = read_csv(filepath)
     df["StdDev"] = pd.to_numeric(df["StdDev"], errors="coerce")
     return df
 
@@ -58,7 +64,7 @@ def get_available_font(font_style: str) -> str:
     return font_style
 
 
-def create_figure(df: pd.DataFrame, save_path: Path, background: str = "sepia") -> None:
+def create_figure(df: pd.DataFrame, save_path: Path, background: str = "sepia", formats: tuple = ("pdf", "png")) -> None:
     bg_color = COLORS["bg_sepia"] if background == "sepia" else COLORS["bg_white"]
 
     font_name = get_available_font(FONT_STYLE)
@@ -196,7 +202,7 @@ def create_figure(df: pd.DataFrame, save_path: Path, background: str = "sepia")
 
     plt.tight_layout()
 
-    for fmt in ["pdf", "png"]:
+    for fmt in formats:
         output_path = save_path.with_suffix(f".{fmt}")
         fig.savefig(str(output_path), facecolor=bg_color, edgecolor="none")
         print(f"Saved: {output_path}")
@@ -205,6 +211,12 @@ def create_figure(df: pd.DataFrame, save_path: Path, background: str = "sepia")
 
 
 def main():
+    output_path = OUTPUT_DIR / "fig1_leaderboard"
+    formats = figure_cache.stale_formats(Path(__file__), ("pdf", "png"))
+    if not formats:
+        print(f"{output_path.name} is up to date")
+        return
+
     print(f"Loading data from: {DATA_PATH}")
     df = load_data(DATA_PATH)
     print(f"Loaded {len(df)} methods")
@@ -212,8 +224,8 @@ def main():
     print(f"\nBackground style: {BACKGROUND}")
     print()
 
-    output_path = OUTPUT_DIR / "fig1_leaderboard"
-    create_figure(df, output_path, background=BACKGROUND)
+    create_figure(df, output_path, background=BACKGROUND, formats=formats)
+    figure_cache.record(sys.modules[__name__], formats, output_path)
 
     print("\nDone!")
 
@@ -6,9 +6,16 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import matplotlib.font_manager as fm
 import numpy as np
-from adjustText import adjust_text
+import sys
 from pathlib import Path
 
+import figure_cache
+from label_placement import place_labels
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from parsed_cache import read_csv  # noqa: E402
+from pareto import pareto_mask  # noqa: E402
+
 FONT_STYLE = "monospace"
 
 FONT_FALLBACKS = {
@@ -70,6 +77,7 @@ SCRIPT_DIR = Path(__file__).parent
 DATA_PATH = SCRIPT_DIR / "data" / "fig2_time_vs_performance.csv"
 OUTPUT_DIR = SCRIPT_DIR / "figures"
 OUTPUT_DIR.mkdir(exist_ok=True)
+LABEL_CACHE_DIR = SCRIPT_DIR / ".cache" / "labels"
 
 
 def time_to_hours(time_str: str) -> float:
@@ -83,7 +91,7 @@ def time_to_hours(time_str: str) -> float:
 
 
 def load_data(filepath: Path) -> pd.DataFrame:
-    df = pd.read_csv(filepath)
+    df = read_csv(filepath)
     df["AvgTimeHours"] = df["AvgTime"].apply(time_to_hours)
     df["StdTimeHours"] = df["StdTime"].apply(time_to_hours)
     df["StdPerf"] = pd.to_numeric(df["StdPerf"], errors="coerce")
@@ -98,7 +106,7 @@ def get_available_font(font_style: str) -> str:
     return font_style
 
 
-def create_figure(df: pd.DataFrame, save_path: Path, background: str = "sepia") -> None:
+def create_figure(df: pd.DataFrame, save_path: Path, background: str = "sepia", formats: tuple = ("pdf", "png")) -> None:
     bg_color = COLORS["bg_sepia"] if background == "sepia" else COLORS["bg_white"]
 
     font_name = get_available_font(FONT_STYLE)
@@ -121,15 +129,13 @@ def create_figure(df: pd.DataFrame, save_path: Path, background: str = "sepia")
     fig.patch.set_facecolor(bg_color)
     ax.set_facecolor(bg_color)
 
-    # Manual nudges applied AFTER adjustText (in data coordinates: dx_hours, dy_percent)
+    # Manual nudges applied AFTER label placement (in data coordinates: dx_hours, dy_percent)
     # Edit these to fine-tune individual label positions
     MANUAL_NUDGES = {
         # "Agent Name": (dx, dy),
-        "MiniMax M2.5": (0.0, -1.0),
-        "Sonnet 4.6": (0.0, -1.5),
-        "GPT-5.1 Codex Max" : (0.0, -0.2),
-        "Opus 4.6": (0.0, 0.2),
-        "Gemini 3.1 Pro": (0.0, 0.2)
+        # Every spot next to its triangle touches the frontier line, so the
+        # placer puts it up-left; centre it over the triangle instead
+        "Gemini 3.1 Pro": (0.8, 0.0),
     }
 
     texts = []
@@ -152,54 +158,17 @@ def create_figure(df: pd.DataFrame, save_path: Path, background: str = "sepia")
         )
 
         texts.append(ax.text(
-            x + 0.2, y + 0.4, row["Agent"],
+            x, y, row["Agent"],
             fontsize=FONT_SIZES["annotation"],
             color=COLORS["text_primary"],
         ))
         text_names.append(row["Agent"])
 
-    x_points = df["AvgTimeHours"].tolist()
-    y_points = df["AvgPerf"].tolist()
-
-    adjust_text(
-        texts, ax=ax,
-        x=x_points, y=y_points,
-        force_text=(0.8, 0.8),
-        force_points=(1.5, 1.5),
-        expand=(1.4, 1.4),
-        expand_points=(2.5, 2.5),
-        ensure_inside_axes=True,
-    )
-
-    # Print label positions for manual tweaking
-    print("\nLabel positions after adjustText:")
-    for text, name in zip(texts, text_names):
-        tx, ty = text.get_position()
-        # Find the original point
-        idx = text_names.index(name)
-        px, py = x_points[idx], y_points[idx]
-        print(f"  {name:20s}  point=({px:.1f}h, {py:.1f}%)  label=({tx:.2f}h, {ty:.2f}%)")
-
-    # Apply manual nudges after adjustText
-    for text, name in zip(texts, text_names):
-        if name in MANUAL_NUDGES:
-            dx, dy = MANUAL_NUDGES[name]
-            cur_x, cur_y = text.get_position()
-            text.set_position((cur_x + dx, cur_y + dy))
-
     # Pareto frontier
     points = df[["AvgTimeHours", "AvgPerf"]].values
-    pareto_mask = np.ones(len(points), dtype=bool)
-
-    for i, (time_i, perf_i) in enumerate(points):
-        for j, (time_j, perf_j) in enumerate(points):
-            if i != j:
-                if time_j <= time_i and perf_j >= perf_i and (time_j < time_i or perf_j > perf_i):
-                    pareto_mask[i] = False
-                    break
-
-    pareto_points = points[pareto_mask]
+    pareto_points = points[pareto_mask(points, maximize=[False, True])]
     pareto_points = pareto_points[pareto_points[:, 0].argsort()]
+    x_frontier, y_frontier = [], []
 
     if len(pareto_points) > 0:
         x_min_data, x_max_data = df["AvgTimeHours"].min(), df["AvgTimeHours"].max()
@@ -259,7 +228,40 @@ def create_figure(df: pd.DataFrame, save_path: Path, background: str = "sepia")
 
     plt.tight_layout()
 
-    for fmt in ["pdf", "png"]:
+    # Labels are placed last, once the limits and layout are final, and also
+    # keep clear of the Pareto frontier line
+    x_points = df["AvgTimeHours"].tolist()
+    y_points = df["AvgPerf"].tolist()
+    frontier_samples = [
+        (x0 + (x1 - x0) * t, y0 + (y1 - y0) * t)
+        for x0, y0, x1, y1 in zip(x_frontier, y_frontier, x_frontier[1:], y_frontier[1:])
+        for t in np.linspace(0, 1, 25)
+    ]
+    place_labels(
+        ax, texts, x_points, y_points,
+        point_size=70,
+        obstacles=frontier_samples,
+        cache_dir=LABEL_CACHE_DIR,
+        leader_style={"color": COLORS["text_secondary"], "linewidth": 0.6, "zorder": 2},
+    )
+
+    # Print label positions for manual tweaking
+    print("\nLabel positions after placement:")
+    for text, name in zip(texts, text_names):
+        tx, ty = text.get_position()
+        # Find the original point
+        idx = text_names.index(name)
+        px, py = x_points[idx], y_points[idx]
+        print(f"  {name:20s}  point=({px:.1f}h, {py:.1f}%)  label=({tx:.2f}h, {ty:.2f}%)")
+
+    # Apply manual nudges after placement
+    for text, name in zip(texts, text_names):
+        if name in MANUAL_NUDGES:
+            dx, dy = MANUAL_NUDGES[name]
+            cur_x, cur_y = text.get_position()
+            text.set_position((cur_x + dx, cur_y + dy))
+
+    for fmt in formats:
         output_path = save_path.with_suffix(f".{fmt}")
         fig.savefig(str(output_path), facecolor=bg_color, edgecolor="none")
         print(f"Saved: {output_path}")
@@ -268,6 +270,12 @@ def create_figure(df: pd.DataFrame, save_path: Path, background: str = "sepia")
 
 
 def main():
+    output_path = OUTPUT_DIR / "fig2_time_vs_performance"
+    formats = figure_cache.stale_formats(Path(__file__), ("pdf", "png"))
+    if not formats:
+        print(f"{output_path.name} is up to date")
+        return
+
     print(f"Loading data from: {DATA_PATH}")
     df = load_data(DATA_PATH)
     print(f"Loaded {len(df)} agents")
@@ -275,8 +283,8 @@ def main():
     print(f"\nBackground style: {BACKGROUND}")
     print()
 
-    output_path = OUTPUT_DIR / "fig2_time_vs_performance"
-    create_figure(df, output_path, background=BACKGROUND)
+    create_figure(df, output_path, background=BACKGROUND, formats=formats)
+    figure_cache.record(sys.modules[__name__], formats, output_path)
 
     print("\nDone!")
 
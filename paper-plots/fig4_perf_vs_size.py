@@ -7,8 +7,14 @@ import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 import matplotlib.font_manager as fm
 import numpy as np
+import sys
 from pathlib import Path
 
+import figure_cache
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from parsed_cache import read_csv  # noqa: E402
+
 FONT_STYLE = "monospace"
 
 FONT_FALLBACKS = {
@@ -44,7 +50,7 @@ OUTPUT_DIR.mkdir(exist_ok=True)
 
 
 def load_data(filepath: Path) -> pd.DataFrame:
-    df = pd.read_csv(filepath)
+    df = read_csv(filepath)
     df.columns = df.columns.str.strip()
     df["agent"] = df["agent"].str.strip()
     return df
@@ -58,7 +64,7 @@ def get_available_font(font_style: str) -> str:
     return font_style
 
 
-def create_figure(df: pd.DataFrame, save_path: Path, background: str = "white") -> None:
+def create_figure(df: pd.DataFrame, save_path: Path, background: str = "white", formats: tuple = ("pdf", "png")) -> None:
     bg_color = COLORS["bg_sepia"] if background == "sepia" else COLORS["bg_white"]
 
     font_name = get_available_font(FONT_STYLE)
@@ -152,7 +158,7 @@ def create_figure(df: pd.DataFrame, save_path: Path, background: str = "white")
 
     plt.tight_layout()
 
-    for fmt in ["pdf", "png"]:
+    for fmt in formats:
         output_path = save_path.with_suffix(f".{fmt}")
         fig.savefig(str(output_path), facecolor=bg_color, edgecolor="none")
         print(f"Saved: {output_path}")
@@ -161,6 +167,12 @@ def create_figure(df: pd.DataFrame, save_path: Path, background: str = "white")
 
 
 def main():
+    output_path = OUTPUT_DIR / "fig4_perf_vs_size"
+    formats = figure_cache.stale_formats(Path(__file__), ("pdf", "png"))
+    if not formats:
+        print(f"{output_path.name} is up to date")
+        return
+
     print(f"Loading data from: {DATA_PATH}")
     df = load_data(DATA_PATH)
     print(f"Loaded {len(df)} models")
@@ -168,8 +180,8 @@ def main():
     print(f"\nBackground style: {BACKGROUND}")
     print()
 
-    output_path = OUTPUT_DIR / "fig4_perf_vs_size"
-    create_figure(df, output_path, background=BACKGROUND)
+    create_figure(df, output_path, background=BACKGROUND, formats=formats)
+    figure_cache.record(sys.modules[__name__], formats, output_path)
 
     print("\nDone!")
 
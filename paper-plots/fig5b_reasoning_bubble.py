@@ -5,8 +5,14 @@ Figure 5b: Reasoning Effort - Bubble Plot
 import pandas as pd
 import matplotlib.pyplot as plt
 import matplotlib.font_manager as fm
+import sys
 from pathlib import Path
 
+import figure_cache
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from parsed_cache import read_csv  # noqa: E402
+
 FONT_STYLE = "monospace"
 
 FONT_FALLBACKS = {
@@ -43,7 +49,7 @@ OUTPUT_DIR.mkdir(exist_ok=True)
 
 
 def load_data(filepath: Path) -> pd.DataFrame:
-    return pd.read_csv(filepath)
+    return read_csv(filepath)
 
 
 def get_available_font(font_style: str) -> str:
@@ -54,7 +60,7 @@ def get_available_font(font_style: str) -> str:
     return font_style
 
 
-def create_figure(df: pd.DataFrame, save_path: Path, background: str = "white") -> None:
+def create_figure(df: pd.DataFrame, save_path: Path, background: str = "white", formats: tuple = ("pdf", "png")) -> None:
     bg_color = COLORS["bg_sepia"] if background == "sepia" else COLORS["bg_white"]
 
     font_name = get_available_font(FONT_STYLE)
@@ -157,7 +163,7 @@ def create_figure(df: pd.DataFrame, save_path: Path, background: str = "white")
 
     plt.tight_layout()
 
-    for fmt in ["pdf", "png"]:
+    for fmt in formats:
         output_path = save_path.with_suffix(f".{fmt}")
         fig.savefig(str(output_path), facecolor=bg_color, edgecolor="none")
         print(f"Saved: {output_path}")
@@ -166,14 +172,20 @@ def create_figure(df: pd.DataFrame, save_path: Path, background: str = "white")
 
 
 def main():
+    output_path = OUTPUT_DIR / "fig5b_reasoning_bubble"
+    formats = figure_cache.stale_formats(Path(__file__), ("pdf", "png"))
+    if not formats:
+        print(f"{output_path.name} is up to date")
+        return
+
     print(f"Loading data from: {DATA_PATH}")
     df = load_data(DATA_PATH)
     print(df.to_string(index=False))
     print(f"\nBackground style: {BACKGROUND}")
     print()
 
-    output_path = OUTPUT_DIR / "fig5b_reasoning_bubble"
-    create_figure(df, output_path, background=BACKGROUND)
+    create_figure(df, output_path, background=BACKGROUND, formats=formats)
+    figure_cache.record(sys.modules[__name__], formats, output_path)
 
     print("\nDone!")
 
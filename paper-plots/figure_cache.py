@@ -0,0 +1,93 @@
+"""
+Content-addressed cache for rendered figures
+
+Each render records what went into an output file: the sha256 of the figure
+script (and so of its COLORS, FONT_SIZES, FIGURE_SIZE, OUTPUT_DPI and
+BACKGROUND), of the local helper modules it uses and of its data CSV, plus the
+matplotlib version and any background override. The render is skipped while
+all of those still match and the output file has not been touched since.
+
+Checking an entry only hashes files, so it doesn't import matplotlib or the
+figure script.
+"""
+
+import hashlib
+import importlib.metadata
+import inspect
+import json
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+CACHE_DIR = SCRIPT_DIR / ".cache" / "figures"
+
+# Modules imported from these directories count as part of the figure
+LOCAL_DIRS = (SCRIPT_DIR, SCRIPT_DIR.parent)
+
+
+def file_sha256(path: Path) -> str | None:
+    try:
+        return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+def matplotlib_version() -> str:
+    return importlib.metadata.version("matplotlib")
+
+
+def entry_path(script: Path, fmt: str) -> Path:
+    return CACHE_DIR / f"{Path(script).stem}.{fmt}.json"
+
+
+def helper_files(module) -> set[Path]:
+    files = set()
+    for value in vars(module).values():
+        source = inspect.getmodule(value)
+        path = getattr(source, "__file__", None)
+        if path and Path(path).resolve().parent in LOCAL_DIRS:
+            files.add(Path(path).resolve())
+    return files
+
+
+def is_fresh(script: Path, fmt: str, data_path: Path | None = None, background: str | None = None) -> bool:
+    # data_path=None stands for the script's own DATA_PATH
+    try:
+        entry = json.loads(entry_path(script, fmt).read_text())
+        stat = Path(entry["output"]).stat()
+    except (OSError, ValueError, KeyError):
+        return False
+    if entry["script"] != str(Path(script).resolve()) or entry["background"] != background:
+        return False
+    if entry["data"] != (data_path and str(Path(data_path).resolve())):
+        return False
+    if (stat.st_size, stat.st_mtime_ns) != (entry["size"], entry["mtime_ns"]):
+        return False
+    if entry["matplotlib"] != matplotlib_version():
+        return False
+    return all(file_sha256(Path(path)) == digest for path, digest in entry["inputs"].items())
+
+
+def stale_formats(script: Path, formats: tuple, data_path: Path | None = None, background: str | None = None) -> tuple:
+    return tuple(fmt for fmt in formats if not is_fresh(script, fmt, data_path, background))
+
+
+def record(module, formats: tuple, save_path: Path, data_path: Path | None = None, background: str | None = None) -> None:
+    script = Path(module.__file__).resolve()
+    inputs = {script, Path(data_path or module.DATA_PATH).resolve()} | helper_files(module)
+    digests = {str(path): file_sha256(path) for path in sorted(inputs)}
+
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    for fmt in formats:
+        output = Path(save_path).with_suffix(f".{fmt}").resolve()
+        stat = output.stat()
+        entry = {
+            "script": str(script),
+            "data": data_path and str(Path(data_path).resolve()),
+            "background": background,
+            "matplotlib": matplotlib_version(),
+            "inputs": digests,
+            "output": str(output),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+        }
+        entry_path(script, fmt).write_text(json.dumps(entry, indent=2))
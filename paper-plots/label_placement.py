@@ -0,0 +1,217 @@
+"""
+Deterministic label placement for scatter plots
+
+Replaces adjustText for the paper figures. Each label is tried at a fixed list
+of candidate offsets around its point and gets the cheapest one, where cost
+counts overlap with labels placed so far, with markers and other obstacles,
+with the axes edge, and coming closer to another point than to its own, which
+would make the label read as that point's. Labels that end up beyond the
+first ring of candidates can be tied to their point with a leader line. Overlap queries go through a uniform grid, so a layout
+costs O(labels x candidates) instead of adjustText's iterative repulsion.
+
+Layouts are cached on disk, keyed by the points, labels, font, figure size and
+axes geometry, so re-rendering unchanged data skips placement entirely.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+LAYOUT_VERSION = 2
+
+# (dx, dy) directions in order of preference, tried at growing distances
+DIRECTIONS = [(1, 1), (1, 0), (1, -1), (-1, 1), (-1, 0), (-1, -1), (0, 1), (0, -1)]
+RADII = [1.0, 2.0, 3.5]
+
+OVERLAP_COST = 1000.0
+# Per marker within one gap of the label, other than its own; below any real
+# overlap, but far above the preference order of the candidates
+AMBIGUITY_COST = 100.0
+OUTSIDE_COST = 10000.0
+
+
+class RectGrid:
+    def __init__(self, cell_size: float):
+        self.cell_size = max(cell_size, 1.0)
+        self.cells = {}
+        self.rects = []
+
+    def _cells(self, rect):
+        x0, y0, x1, y1 = (int(np.floor(v / self.cell_size)) for v in rect)
+        for ix in range(x0, x1 + 1):
+            for iy in range(y0, y1 + 1):
+                yield ix, iy
+
+    def add(self, rect) -> None:
+        index = len(self.rects)
+        self.rects.append(rect)
+        for cell in self._cells(rect):
+            self.cells.setdefault(cell, []).append(index)
+
+    def overlap(self, rect, limit: float = np.inf, skip: int | None = None) -> float:
+        # Stops early once the total exceeds `limit`; the result is then only
+        # known to be above it. Rect number `skip` is left out.
+        seen = {skip}
+        total = 0.0
+        x0, y0, x1, y1 = rect
+        for cell in self._cells(rect):
+            for index in self.cells.get(cell, ()):
+                if index in seen:
+                    continue
+                seen.add(index)
+                ox0, oy0, ox1, oy1 = self.rects[index]
+                w = (x1 if x1 < ox1 else ox1) - (x0 if x0 > ox0 else ox0)
+                h = (y1 if y1 < oy1 else oy1) - (y0 if y0 > oy0 else oy0)
+                if w > 0 and h > 0:
+                    total += w * h
+                    if total > limit:
+                        return total
+        return total
+
+
+def layout_key(ax, texts, xs, ys, point_size: float, gap: float, obstacles) -> str:
+    fig = ax.figure
+    payload = {
+        "version": LAYOUT_VERSION,
+        "points": np.round(np.column_stack([xs, ys]), 9).tolist(),
+        "labels": [t.get_text() for t in texts],
+        "fonts": [[t.get_fontname(), t.get_fontsize(), t.get_fontweight()] for t in texts],
+        "figsize": list(fig.get_size_inches()),
+        "dpi": fig.dpi,
+        "axes": [list(ax.get_position().bounds), list(ax.get_xlim()), list(ax.get_ylim())],
+        "point_size": point_size,
+        "gap": gap,
+        "obstacles": np.round(np.asarray(obstacles, dtype=float), 9).tolist(),
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+def compute_layout(ax, texts, xs, ys, point_size: float, gap: float, obstacles) -> tuple:
+    # (lower-left corner of each label, leader line of each label or None),
+    # all in data coordinates
+    fig = ax.figure
+    renderer = fig.canvas.get_renderer()
+    to_display = ax.transData.transform
+    to_data = ax.transData.inverted().transform
+
+    points = to_display(np.column_stack([xs, ys]))
+    # Extents wobble at the sub-pixel level with the text's current position;
+    # rounding keeps repeated layouts bit-identical
+    sizes = np.round([[e.width, e.height] for e in (t.get_window_extent(renderer) for t in texts)], 2)
+    axes_box = ax.get_window_extent(renderer)
+
+    # Markers and obstacles are squares of the marker's size in pixels
+    half = np.sqrt(point_size) * fig.dpi / 72 / 2
+    gap = gap * fig.dpi / 72 + half
+
+    # Cells about two text lines high: larger cells hold so many labels in
+    # crowded plots that every query scans most of them
+    heights = sizes.reshape(-1, 2)[:, 1]
+    grid = RectGrid(max(2 * float(np.median(heights)) if len(heights) else 0.0, 2 * half))
+    blockers = RectGrid(2 * half)
+    obstacle_points = to_display(np.asarray(obstacles, dtype=float).reshape(-1, 2)) if len(obstacles) else []
+    for px, py in list(points) + list(obstacle_points):
+        blockers.add((px - half, py - half, px + half, py + half))
+    # Markers alone, in point order, for the ambiguity term
+    markers = RectGrid(grid.cell_size)
+    for px, py in points:
+        markers.add((px - half, py - half, px + half, py + half))
+    margin = gap - half
+
+    # Crowded points first, so they get the best spots
+    crowding = [blockers.overlap((px - 3 * half, py - 3 * half, px + 3 * half, py + 3 * half)) for px, py in points]
+    order = sorted(range(len(texts)), key=lambda i: (-crowding[i], i))
+
+    positions = [None] * len(texts)
+    leaders = [None] * len(texts)
+    for i in order:
+        (px, py), (w, h) = points[i], sizes[i]
+        best = None
+        for rank, (radius, (dx, dy)) in enumerate((r, d) for r in RADII for d in DIRECTIONS):
+            # Later candidates cost at least their rank
+            if best is not None and rank >= best[0]:
+                break
+            x0 = px + dx * gap * radius - (w if dx < 0 else w / 2 if dx == 0 else 0)
+            y0 = py + dy * gap * radius - (h if dy < 0 else h / 2 if dy == 0 else 0)
+            rect = (x0, y0, x0 + w, y0 + h)
+            outside = (x0 < axes_box.x0) + (y0 < axes_box.y0) + (x0 + w > axes_box.x1) + (y0 + h > axes_box.y1)
+            # Overlap area above which this candidate cannot beat the best one;
+            # crowded layouts spend most of their time on such candidates
+            limit = np.inf if best is None else (best[0] - OUTSIDE_COST * outside - rank) * w * h / OVERLAP_COST
+            if limit < 0:
+                continue
+            # The label's own marker is never inside a candidate, so it adds nothing
+            area = grid.overlap(rect, limit)
+            if area <= limit:
+                area += blockers.overlap(rect, limit - area)
+            if area > limit:
+                continue
+            cost = OVERLAP_COST * area / (w * h) + OUTSIDE_COST * outside + rank
+            # Other markers as near to the label as its own one is, again only
+            # as far as it can still matter
+            near_limit = np.inf if best is None else (best[0] - cost) * (2 * half) ** 2 / AMBIGUITY_COST
+            if near_limit < 0:
+                continue
+            near = markers.overlap((x0 - margin, y0 - margin, x0 + w + margin, y0 + h + margin), near_limit, skip=i)
+            cost += AMBIGUITY_COST * near / (2 * half) ** 2
+            if best is None or cost < best[0]:
+                best = (cost, rect, radius)
+            if cost == rank:
+                break
+        grid.add(best[1])
+        x0, y0, x1, y1 = best[1]
+        positions[i] = to_data((x0, y0)).tolist()
+        if best[2] > RADII[0]:
+            # From the marker's edge to the nearest point of the label
+            end = np.array([min(max(px, x0), x1), min(max(py, y0), y1)])
+            start = points[i] + (end - points[i]) * half / max(np.hypot(*(end - points[i])), half)
+            leaders[i] = to_data(np.array([start, end])).tolist()
+    return positions, leaders
+
+
+def place_labels(ax, texts, xs, ys, point_size: float = 70, gap: float = 3.0, obstacles=(),
+                 cache_dir: Path | None = None, leader_style: dict | None = None) -> list:
+    """Move each Text so it sits next to its (x, y) point without overlaps.
+
+    Call after the axes limits and layout are final. Texts are anchored at
+    their lower-left corner; the returned positions are in data coordinates.
+    With leader_style (Line2D properties), labels placed beyond the first ring
+    of candidates get a line from their point's marker.
+    """
+    for text in texts:
+        text.set_horizontalalignment("left")
+        text.set_verticalalignment("bottom")
+
+    cache_file = None
+    layout = None
+    if cache_dir is not None:
+        cache_file = Path(cache_dir) / f"{layout_key(ax, texts, xs, ys, point_size, gap, obstacles)}.json"
+        try:
+            layout = json.loads(cache_file.read_text())
+        except (OSError, ValueError):
+            # Missing or unreadable entries are recomputed and rewritten
+            layout = None
+
+    if layout is None:
+        positions, leaders = compute_layout(ax, texts, xs, ys, point_size, gap, obstacles)
+        layout = {"positions": positions, "leaders": leaders}
+        if cache_file is not None:
+            # build_figures.py renders a figure's formats in parallel with the
+            # same key, so the entry is written under a temporary name and
+            # renamed; readers never see a partial file
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = cache_file.with_name(f".{cache_file.name}.{os.getpid()}.tmp")
+            tmp_file.write_text(json.dumps(layout))
+            os.replace(tmp_file, cache_file)
+
+    for text, position in zip(texts, layout["positions"]):
+        text.set_position(position)
+    if leader_style is not None:
+        for leader in layout["leaders"]:
+            if leader is not None:
+                (x0, y0), (x1, y1) = leader
+                ax.plot([x0, x1], [y0, y1], scalex=False, scaley=False, **leader_style)
+    return layout["positions"]
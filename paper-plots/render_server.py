@@ -0,0 +1,200 @@
+"""
+Warm render server for paper figures
+
+Keeps matplotlib, pandas and the resolved fonts loaded so that
+re-rendering a figure while tweaking it skips the start-up cost.
+
+    python render_server.py serve              # in one terminal
+    python render_server.py render fig2        # re-render after each edit
+    python render_server.py render fig1 --data other.csv --formats png
+    python render_server.py stop
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import socket
+import socketserver
+import sys
+import threading
+import time
+import traceback
+from pathlib import Path
+
+import figure_cache
+from build_figures import FORMATS, SCRIPT_DIR, discover_figures, load_figure_module
+
+SOCKET_PATH = SCRIPT_DIR / ".render.sock"
+
+_fonts = {}
+
+
+def warm_up() -> None:
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.font_manager as fm
+    import matplotlib.pyplot  # noqa: F401
+    import pandas  # noqa: F401
+    fm.fontManager.ttflist  # builds or loads the font cache
+
+
+def with_cached_fonts(module):
+    # get_available_font() scans fm.fontManager.ttflist on every call; resolve
+    # each fallback list once for the lifetime of the server instead.
+    if hasattr(module, "_uncached_get_available_font"):
+        return module
+    module._uncached_get_available_font = module.get_available_font
+
+    def get_available_font(font_style: str) -> str:
+        key = (font_style, tuple(module.FONT_FALLBACKS.get(font_style, ())))
+        if key not in _fonts:
+            _fonts[key] = module._uncached_get_available_font(font_style)
+        return _fonts[key]
+
+    module.get_available_font = get_available_font
+    return module
+
+
+def render(request: dict) -> dict:
+    import matplotlib.pyplot as plt
+
+    start = time.perf_counter()
+    log = io.StringIO()
+    try:
+        scripts = discover_figures([request["figure"]])
+        if len(scripts) != 1:
+            matches = ", ".join(s.stem for s in scripts) or "nothing"
+            raise ValueError(f"figure {request['figure']!r} matched {matches}")
+        script = scripts[0]
+        formats = tuple(request.get("formats") or FORMATS)
+        data_path = Path(request["data"]) if request.get("data") else None
+        if not request.get("force"):
+            formats = figure_cache.stale_formats(script, formats, data_path, request.get("background"))
+        if not formats:
+            return {"ok": True, "elapsed": time.perf_counter() - start, "outputs": [], "log": ""}
+
+        with contextlib.redirect_stdout(log):
+            module = with_cached_fonts(load_figure_module(script))
+            save_path = module.OUTPUT_DIR / script.stem
+            # create_figure() updates plt.rcParams globally; rc_context restores
+            # them afterwards so one figure's settings never leak into the next.
+            with plt.rc_context():
+                df = module.load_data(data_path or module.DATA_PATH)
+                module.create_figure(
+                    df,
+                    save_path,
+                    background=request.get("background") or module.BACKGROUND,
+                    formats=formats,
+                )
+            plt.close("all")
+            figure_cache.record(module, formats, save_path, data_path, request.get("background"))
+        outputs = [str(save_path.with_suffix(f".{fmt}")) for fmt in formats]
+        return {"ok": True, "elapsed": time.perf_counter() - start, "outputs": outputs, "log": log.getvalue()}
+    except Exception:
+        return {
+            "ok": False,
+            "elapsed": time.perf_counter() - start,
+            "log": log.getvalue(),
+            "error": traceback.format_exc(),
+        }
+
+
+class RenderHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        request = json.loads(self.rfile.readline())
+        if request.get("command") == "render":
+            response = render(request)
+        else:
+            response = {"ok": True}
+        self.wfile.write(json.dumps(response).encode() + b"\n")
+        if request.get("command") == "stop":
+            # shutdown() waits for serve_forever() to return, so it can't be
+            # called from the thread that is handling this request
+            threading.Thread(target=self.server.shutdown).start()
+
+
+class RenderServer(socketserver.UnixStreamServer):
+    # Requests are handled one at a time: pyplot state is process-global.
+    pass
+
+
+def serve() -> int:
+    if SOCKET_PATH.exists():
+        try:
+            send({"command": "ping"}, timeout=1)
+            print(f"A render server is already listening on {SOCKET_PATH}")
+            return 1
+        except OSError:
+            SOCKET_PATH.unlink()
+
+    start = time.perf_counter()
+    warm_up()
+    print(f"Warmed up in {time.perf_counter() - start:.2f}s, listening on {SOCKET_PATH}")
+    try:
+        with RenderServer(str(SOCKET_PATH), RenderHandler) as server:
+            server.serve_forever(poll_interval=0.1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        SOCKET_PATH.unlink(missing_ok=True)
+    return 0
+
+
+def send(request: dict, timeout: float | None = None) -> dict:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(str(SOCKET_PATH))
+        sock.sendall(json.dumps(request).encode() + b"\n")
+        with sock.makefile("rb") as f:
+            return json.loads(f.readline())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Warm render server for paper figures")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("serve", help="start the server in the foreground")
+    subparsers.add_parser("stop", help="stop a running server")
+    render_parser = subparsers.add_parser("render", help="render a figure on the running server")
+    render_parser.add_argument("figure", help="figure name prefix, e.g. fig2")
+    render_parser.add_argument("--data", help="CSV to render from (default: the figure's DATA_PATH)")
+    render_parser.add_argument("--formats", nargs="+", help="output formats (default: pdf png)")
+    render_parser.add_argument("--background", choices=["white", "sepia"], help="override the figure's BACKGROUND")
+    render_parser.add_argument("--force", action="store_true", help="redraw even if the outputs are up to date")
+    render_parser.add_argument("--verbose", action="store_true", help="print the figure's own output")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        return serve()
+
+    request = {"command": args.command}
+    if args.command == "render":
+        # The server has its own working directory, so relative paths are resolved here
+        data = str(Path(args.data).resolve()) if args.data else None
+        request.update(
+            figure=args.figure, data=data, formats=args.formats, background=args.background, force=args.force,
+        )
+    try:
+        response = send(request)
+    except (FileNotFoundError, ConnectionRefusedError):
+        print(f"No render server on {SOCKET_PATH}; start one with: python {Path(__file__).name} serve")
+        return 1
+
+    if args.command == "stop":
+        print("Stopped")
+        return 0
+    if args.verbose or not response["ok"]:
+        print(response["log"], end="")
+    if not response["ok"]:
+        print(response["error"], end="")
+        return 1
+    if not response["outputs"]:
+        print(f"{args.figure} is up to date")
+    for output in response["outputs"]:
+        print(f"Saved: {output}")
+    print(f"Rendered in {response['elapsed']:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,300 @@
+"""
+Paper figure inputs and LaTeX tables from the scores.json model
+
+generate_data.py --paper hands its in-memory model (the score tensor, its
+aggregates and the output it is about to serialize) to writers(), so the
+paper artifacts come from the same numbers as the web data, in the same run,
+without re-reading data/:
+
+    paper-plots/data/fig1_leaderboard.csv          leaderboard average per agent
+    paper-plots/data/fig2_time_vs_performance.csv  time and score per agent
+    paper-plots/table_leaderboard.tex              ranked per-benchmark table
+    paper-plots/table_reasoning_effort.tex         from fig5_reasoning_effort.csv
+
+Only the body of each table, down to \\bottomrule, is regenerated; the
+preamble, caption and column headers of the .tex files are kept as edited. Which
+agents appear in the paper and under which names is set below, separately from
+config.js, since the paper names agents differently from the site.
+"""
+
+import csv
+import functools
+import io
+from dataclasses import dataclass
+from pathlib import Path
+
+import generate_data as gd
+from parsed_cache import read_table
+
+PAPER_DIR = Path("paper-plots")
+LEADERBOARD_CSV = Path("data") / "fig1_leaderboard.csv"
+TIME_CSV = Path("data") / "fig2_time_vs_performance.csv"
+REASONING_EFFORT_CSV = Path("data") / "fig5_reasoning_effort.csv"
+LEADERBOARD_TABLE = Path("table_leaderboard.tex")
+REASONING_EFFORT_TABLE = Path("table_reasoning_effort.tex")
+
+# Agent labels in the figures, in fig1 (leaderboard) order
+FIGURE_LABELS = {
+    "human": "Official Instruct Models",
+    "opus-4.6": "Opus 4.6",
+    "gemini-3.1-pro": "Gemini 3.1 Pro",
+    "gpt-5.2": "GPT-5.2",
+    "gpt-5.4-high": "GPT 5.4 (High)",
+    "gpt-5.1-codex-max": "GPT-5.1 Codex Max",
+    "gemini-3-pro": "Gemini 3 Pro",
+    "gpt-5.3-codex-high": "GPT 5.3 Codex (High)",
+    "gpt-5.2-codex": "GPT-5.2 Codex",
+    "opus-4.5": "Opus 4.5",
+    "sonnet-4.6": "Sonnet 4.6",
+    "glm-5": "GLM-5",
+    "sonnet-4.5": "Sonnet 4.5",
+    "kimi-k2.5": "Kimi K2.5",
+    "minimax-m2.5": "MiniMax M2.5",
+    "base-model": "Base Model",
+}
+LEADERBOARD_AGENTS = ["human", "opus-4.6", "gemini-3.1-pro", "gpt-5.2", "gpt-5.4-high", "gpt-5.1-codex-max",
+                      "gemini-3-pro", "gpt-5.3-codex-high", "gpt-5.2-codex", "opus-4.5", "sonnet-4.6", "glm-5",
+                      "sonnet-4.5", "base-model"]
+# Row order matters: fig2 places labels in this order
+TIME_AGENTS = ["opus-4.6", "gemini-3.1-pro", "gpt-5.2", "gpt-5.1-codex-max", "gemini-3-pro", "opus-4.5",
+               "gpt-5.2-codex", "gpt-5.3-codex-high", "gpt-5.4-high", "sonnet-4.6", "sonnet-4.5", "glm-5",
+               "kimi-k2.5", "minimax-m2.5"]
+
+# (name, scaffold) of each agent in table_leaderboard.tex; baselines have no scaffold
+TABLE_NAMES = {
+    "human": ("Official Instruct Models (baseline)", None),
+    "base-model": ("Base Model (Zero-Shot)", None),
+    "base-model-fewshot": ("Base Model (Few-Shot)", None),
+    "opus-4.6": ("Claude Opus 4.6", "Claude Code"),
+    "opus-4.5": ("Claude Opus 4.5", "Claude Code"),
+    "opus-4.5-opencode": ("Claude Opus 4.5", "OpenCode"),
+    "sonnet-4.6": ("Claude Sonnet 4.6", "Claude Code"),
+    "sonnet-4.5": ("Claude Sonnet 4.5", "Claude Code"),
+    "gemini-3.1-pro": ("Gemini 3.1 Pro", "OpenCode"),
+    "gemini-3-pro": ("Gemini 3 Pro", "Gemini CLI"),
+    "gemini-3-pro-opencode": ("Gemini 3 Pro", "OpenCode"),
+    "gpt-5.2": ("GPT-5.2", "Codex CLI"),
+    "gpt-5.4-high": ("GPT 5.4 (High)", "Codex CLI"),
+    "gpt-5.1-codex-max": ("GPT 5.1 Codex Max", "Codex CLI"),
+    "gpt-5.1-codex-max-opencode": ("GPT 5.1 Codex Max", "OpenCode"),
+    "gpt-5.3-codex-high": ("GPT 5.3 Codex (High)", "Codex CLI"),
+    "gpt-5.3-codex-med": ("GPT 5.3 Codex (Med)", "Codex CLI"),
+    "gpt-5.2-codex": ("GPT 5.2 Codex", "Codex CLI"),
+    "glm-5": ("GLM 5", "OpenCode"),
+    "glm-4.7": ("GLM 4.7", "OpenCode"),
+    "kimi-k2.5": ("Kimi K2.5", "OpenCode"),
+    "kimi-k2": ("Kimi K2 Thinking", "OpenCode"),
+    "minimax-m2.5": ("MiniMax M2.5", "OpenCode"),
+    "minimax-m2.1": ("MiniMax M2.1", "OpenCode"),
+    "qwen3-max": ("Qwen3 Max", "Claude Code"),
+}
+# Baselines drawn as shaded rows without heatmap colours
+SHADED_BASELINES = {"base-model", "base-model-fewshot"}
+MEDALS = ["goldmedal", "silvermedal", "bronzemedal"]
+# time_aggregated.csv row of each reasoning effort level in fig5_reasoning_effort.csv
+EFFORT_TIME_LABELS = {"Low": "GPT-5.1-Codex-Max Low", "Medium": "GPT-5.1-Codex-Max", "High": "GPT-5.1-Codex-Max High"}
+# Heatmap colours perf0 ... perf80 step by 10 points
+HEATMAP_STEP = 10
+HEATMAP_MAX = 80
+
+
+@dataclass
+class PaperData:
+    # Unrounded numbers; each artifact rounds once, when formatting
+    leaderboard: dict  # agent key -> LeaderboardRow, best first
+    time_seconds: dict  # agent key -> (avg, std or None) seconds, not rounded to hours
+    effort_seconds: dict  # reasoning effort level -> (avg, std) seconds
+
+
+@dataclass
+class LeaderboardRow:
+    score: float
+    std: float | None
+    benchmarks: list  # (value, std or None) per benchmark, in BENCHMARKS order
+
+
+def paper_data(output, tensor, aggregates, time_seconds):
+    scores = gd.overall_scores(tensor, aggregates, output["aggregatedScores"])
+    leaderboard = {}
+    # Same order as leaderboardViews.average
+    for a in sorted(range(len(tensor.agents)), key=lambda a: -scores[a][0]):
+        stds = aggregates["benchmark_stds"][a] if tensor.has_std[a] else [None] * len(gd.BENCHMARKS)
+        leaderboard[tensor.agents[a]] = LeaderboardRow(
+            score=scores[a][0], std=scores[a][1],
+            benchmarks=list(zip(aggregates["benchmark_values"][a].tolist(), list(stds))))
+    return PaperData(leaderboard=leaderboard, time_seconds=time_seconds,
+                     effort_seconds=effort_time_seconds(gd.DATA_DIR / "time_aggregated.csv"))
+
+
+def published_rows(csv_file):
+    # Rows of the current file by their first column, so agents without data
+    # in this build keep the row the paper was built with
+    if not csv_file.exists():
+        return {}
+    with open(csv_file, "r", newline="") as f:
+        rows = list(csv.reader(f))
+    return {row[0]: row for row in rows[1:] if row}
+
+
+def warn_missing(artifact, kept, missing):
+    if kept:
+        print(f"{artifact}: no data for {', '.join(kept)}, kept the existing rows")
+    if missing:
+        print(f"{artifact}: no data for {', '.join(missing)}, left out")
+
+
+def csv_text(header, rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(header)
+    writer.writerows(rows)
+    return buffer.getvalue()
+
+
+def one_decimal(value):
+    return "" if value is None else f"{float(value):.1f}"
+
+
+def leaderboard_csv(data, paper_dir):
+    published = published_rows(paper_dir / LEADERBOARD_CSV)
+    rows, kept, missing = [], [], []
+    for key, row in data.leaderboard.items():
+        if key in LEADERBOARD_AGENTS:
+            rows.append([FIGURE_LABELS[key], one_decimal(row.score), one_decimal(row.std)])
+    for key in LEADERBOARD_AGENTS:
+        if key in data.leaderboard:
+            continue
+        if FIGURE_LABELS[key] in published:
+            rows.append(published[FIGURE_LABELS[key]])
+            kept.append(key)
+        else:
+            missing.append(key)
+    warn_missing(LEADERBOARD_CSV.name, kept, missing)
+    # Kept rows go where their score ranks them
+    rows.sort(key=lambda row: -float(row[1]))
+    return csv_text(["Method", "Avg", "StdDev"], rows)
+
+
+def time_csv(data, paper_dir):
+    published = published_rows(paper_dir / TIME_CSV)
+    rows, kept, missing = [], [], []
+    for key in TIME_AGENTS:
+        label = FIGURE_LABELS[key]
+        if key in data.time_seconds and key in data.leaderboard:
+            (avg, std), row = data.time_seconds[key], data.leaderboard[key]
+            std_time = "" if std is None else gd.format_seconds(std)
+            rows.append([label, gd.format_seconds(avg), std_time, one_decimal(row.score), one_decimal(row.std)])
+        elif label in published:
+            rows.append(published[label])
+            kept.append(key)
+        else:
+            missing.append(key)
+    warn_missing(TIME_CSV.name, kept, missing)
+    return csv_text(["Agent", "AvgTime", "StdTime", "AvgPerf", "StdPerf"], rows)
+
+
+def table_cell(value, std, shaded):
+    value = float(value)
+    number = f"{value:.1f}" if value >= 10 else f"\\phantom{{0}}{value:.1f}"
+    spread = f"\\,\\tiny{{± {float(std):.1f}}}" if std is not None else "\\phantom{\\,\\tiny{± 0.0}}"
+    if shaded:
+        return number + spread
+    level = min(int(value // HEATMAP_STEP) * HEATMAP_STEP, HEATMAP_MAX)
+    return f"\\cellcolor{{perf{level}}}{number}{spread}"
+
+
+def leaderboard_table_rows(data):
+    rows, rank = [], 0
+    for key, entry in data.leaderboard.items():
+        if key not in TABLE_NAMES:
+            continue
+        name, scaffold = TABLE_NAMES[key]
+        if scaffold is None:
+            label, method = "--", name
+        else:
+            rank += 1
+            label = str(rank) if rank > len(MEDALS) else f"\\textcolor{{{MEDALS[rank - 1]}}}{{\\textbf{{{rank}}}}}"
+            method = f"{name} \\scriptsize{{({scaffold})}}"
+        shaded = key in SHADED_BASELINES
+        cells = [table_cell(entry.score, entry.std, shaded)]
+        cells += [table_cell(value, std, shaded) for value, std in entry.benchmarks]
+        if shaded:
+            rows.append("\\rowcolor{gray!15}")
+        rows.append(" & ".join([label, method] + cells) + " \\\\")
+    return rows
+
+
+def effort_time_seconds(time_file):
+    # (avg, std) seconds of each effort level, as time_aggregated.csv gives
+    # them; fig5_reasoning_effort.csv only keeps hours to 3 decimals
+    labels = {label: effort for effort, label in EFFORT_TIME_LABELS.items()}
+    seconds = {}
+    if time_file.exists():
+        with open(time_file, "r") as f:
+            for row in csv.DictReader(f):
+                if row["agent"] in labels:
+                    seconds[labels[row["agent"]]] = (gd.time_to_seconds(row["avg_time"]),
+                                                     gd.time_to_seconds(row["std_time"]))
+    return seconds
+
+
+def reasoning_effort_table_rows(details_file, time_seconds):
+    table = read_table(details_file)
+
+    def spread(value, std):
+        return f"{value}\\,{{\\tiny$\\pm$ {std}}}"
+
+    scores = [spread(f"{score:.1f}", f"{std:.1f}") for score, std in zip(table["score"], table["score_std"])]
+    times = []
+    for effort, hours, std in zip(table["effort"].tolist(), table["time_hours"], table["time_std_hours"]):
+        avg, std = time_seconds.get(effort, (hours * 3600, std * 3600))
+        times.append(spread(gd.format_seconds(avg), gd.format_seconds(std)))
+    tokens = [f"{count:,}" for count in table["tokens"].tolist()]
+    return [
+        " & ".join(["\\textsc{Reasoning Effort}"] + [f"\\textsc{{{effort}}}" for effort in table["effort"]]) + " \\\\",
+        "\\midrule",
+        " & ".join(["Score"] + scores) + " \\\\",
+        " & ".join(["Time taken"] + times) + " \\\\",
+        " & ".join(["Average \\#Tokens per run"] + tokens) + " \\\\",
+    ]
+
+
+def fill_table(tex_file, after, rows):
+    # Replaces the lines between the first `after` line and \bottomrule,
+    # indented like \bottomrule; everything around them is kept as edited
+    tex = tex_file.read_text()
+    start = tex.index(after) + len(after)
+    end = tex.index("\\bottomrule", start)
+    indent = tex[tex.rindex("\n", 0, end) + 1:end]
+    return tex[:start] + "".join(f"{indent}{row}\n" for row in rows) + tex[end - len(indent):]
+
+
+def leaderboard_table(data, paper_dir):
+    return fill_table(paper_dir / LEADERBOARD_TABLE, "\\midrule\n", leaderboard_table_rows(data))
+
+
+def reasoning_effort_table(data, paper_dir):
+    # The effort levels are the header row, so it is rewritten too. The table
+    # comes from the figure data, as token counts are not in data/
+    return fill_table(paper_dir / REASONING_EFFORT_TABLE, "\\rowcolor{bgcream}\n",
+                      reasoning_effort_table_rows(paper_dir / REASONING_EFFORT_CSV, data.effort_seconds))
+
+
+ARTIFACTS = {
+    LEADERBOARD_CSV: leaderboard_csv,
+    TIME_CSV: time_csv,
+    LEADERBOARD_TABLE: leaderboard_table,
+    REASONING_EFFORT_TABLE: reasoning_effort_table,
+}
+
+
+def write_artifact(name, render, data, paper_dir):
+    return gd.write_if_changed(paper_dir / name, render(data, paper_dir))
+
+
+def writers(output, tensor, aggregates, time_seconds, paper_dir=PAPER_DIR):
+    # One callable per artifact, returning whether its file changed, so
+    # generate_data.py can run them next to its own writers
+    data = paper_data(output, tensor, aggregates, time_seconds)
+    return {paper_dir / name: functools.partial(write_artifact, name, render, data, paper_dir)
+            for name, render in ARTIFACTS.items()}
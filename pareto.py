@@ -0,0 +1,115 @@
+"""
+Pareto frontier (skyline) of a set of points
+
+pareto_mask(points) returns which rows of an (n, d) array are not dominated by
+any other row. A row dominates another when it is at least as good in every
+objective and strictly better in at least one; identical rows do not dominate
+each other. Objectives are minimized unless flagged in `maximize`.
+
+    2 objectives:  O(n log n) sort and sweep
+    3+ objectives: sort by coordinate sum, then compare blocks of points
+                   against the frontier found so far with NumPy broadcasting
+"""
+
+import numpy as np
+
+BLOCK_SIZE = 256
+
+
+def _as_minimization(points, maximize):
+    points = np.asarray(points, dtype=np.float64)
+    if points.ndim != 2:
+        raise ValueError(f"expected an (n, d) array of points, got shape {points.shape}")
+    if maximize is not None:
+        maximize = np.asarray(maximize, dtype=bool)
+        if maximize.shape != (points.shape[1],):
+            raise ValueError(f"maximize needs one flag per objective, got {maximize.shape[0]} for {points.shape[1]}")
+        points = np.where(maximize, -points, points)
+    return points
+
+
+def _mask_2d(points):
+    # Sweep in order of the first objective. A point survives if its second
+    # objective is strictly below everything seen at a smaller first
+    # objective, and minimal among points sharing its first objective.
+    x, y = points[:, 0], points[:, 1]
+    order = np.lexsort((y, x))
+    xs, ys = x[order], y[order]
+
+    group_start = np.r_[True, xs[1:] != xs[:-1]]
+    group_id = np.cumsum(group_start) - 1
+    group_min = ys[group_start]
+
+    best_before = np.r_[np.inf, np.minimum.accumulate(group_min)[:-1]]
+    keep_sorted = (ys == group_min[group_id]) & (ys < best_before[group_id])
+
+    mask = np.zeros(len(points), dtype=bool)
+    mask[order] = keep_sorted
+    return mask
+
+
+def _dominates(a, b):
+    # a[..., i, :] dominates b[..., j, :], broadcast over leading axes
+    return np.all(a <= b, axis=-1) & np.any(a < b, axis=-1)
+
+
+def _mask_nd(points, block_size):
+    # A point can only be dominated by points with a strictly smaller
+    # coordinate sum, so after sorting by sum each block only has to be
+    # checked against the frontier so far and against itself.
+    order = np.argsort(points.sum(axis=1), kind="stable")
+    keep_sorted = np.zeros(len(points), dtype=bool)
+    front = np.empty((0, points.shape[1]))
+
+    for start in range(0, len(points), block_size):
+        block = points[order[start:start + block_size]]
+        dominated = _dominates(front[None, :, :], block[:, None, :]).any(axis=1)
+        dominated |= _dominates(block[None, :, :], block[:, None, :]).any(axis=1)
+        keep_sorted[start:start + len(block)] = ~dominated
+        front = np.vstack([front, block[~dominated]])
+
+    mask = np.zeros(len(points), dtype=bool)
+    mask[order] = keep_sorted
+    return mask
+
+
+def _mask_epsilon(points, epsilon, block_size):
+    # Epsilon-dominance (Laumanns et al.): points are snapped to boxes of size
+    # epsilon, the frontier is taken over boxes, and each non-dominated box
+    # keeps the one point closest to its lower corner.
+    epsilon = np.broadcast_to(np.asarray(epsilon, dtype=np.float64), (points.shape[1],))
+    if np.any(epsilon <= 0):
+        raise ValueError("epsilon must be positive")
+    boxes = np.floor(points / epsilon)
+    unique_boxes, box_of_point = np.unique(boxes, axis=0, return_inverse=True)
+    box_of_point = box_of_point.ravel()
+    box_kept = pareto_mask(unique_boxes, block_size=block_size)
+
+    distance = np.linalg.norm((points - boxes * epsilon) / epsilon, axis=1)
+    order = np.lexsort((distance, box_of_point))
+    first_in_box = np.r_[True, box_of_point[order][1:] != box_of_point[order][:-1]]
+    representative = np.zeros(len(points), dtype=bool)
+    representative[order[first_in_box]] = True
+    return representative & box_kept[box_of_point]
+
+
+def pareto_mask(points, maximize=None, epsilon=None, block_size=BLOCK_SIZE):
+    points = _as_minimization(points, maximize)
+    if len(points) == 0:
+        return np.zeros(0, dtype=bool)
+    if np.isnan(points).any():
+        raise ValueError("points must not contain NaN")
+    if epsilon is not None:
+        return _mask_epsilon(points, epsilon, block_size)
+    if points.shape[1] == 1:
+        return points[:, 0] == points[:, 0].min()
+    if points.shape[1] == 2:
+        return _mask_2d(points)
+    return _mask_nd(points, block_size)
+
+
+def pareto_front(points, maximize=None, epsilon=None):
+    # Indices of the frontier, ordered along the first objective
+    points = np.asarray(points, dtype=np.float64)
+    indices = np.flatnonzero(pareto_mask(points, maximize, epsilon))
+    return indices[np.lexsort(points[indices].T[::-1])]
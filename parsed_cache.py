@@ -0,0 +1,186 @@
+"""
+Typed, memory-mapped cache of parsed CSV files
+
+A CSV is parsed once into typed columns (int64, float64 or fixed-width text)
+and written to CACHE_DIR as a single file named after the CSV's sha256. The
+file holds a JSON header line followed by each column's raw bytes, 64-byte
+aligned. Readers map the file and get every column as a zero-copy NumPy view,
+so the text is only parsed again when the content changes. Within a process,
+content hashes are remembered by path, size and mtime, so long-running callers
+(dev_server.py) do not even re-read unchanged CSVs. Files smaller than
+MIN_CACHED_BYTES are parsed directly: a few hundred bytes of CSV parse faster
+than an entry can be hashed, opened and mapped.
+
+Columns are typed the way pandas.read_csv types them: int64 if every cell is
+an integer, float64 if every cell is a number or missing, text otherwise.
+Missing means one of pandas' default NA strings. Text columns also keep a
+float64 copy with NaN for cells that are not numbers. That copy is how
+generate_data.py reads "ERR" and "not stored" cells.
+"""
+
+import contextlib
+import csv
+import hashlib
+import json
+import mmap
+import os
+import re
+import threading
+from pathlib import Path
+
+import numpy as np
+
+CACHE_DIR = Path(__file__).resolve().parent / ".cache" / "parsed"
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+# Smaller files parse faster than their entry can be checked and mapped
+MIN_CACHED_BYTES = 8 << 10
+
+# pandas.read_csv's default na_values
+NA_VALUES = {"", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN", "<NA>",
+             "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null"}
+INT_PATTERN = re.compile(r"\s*[+-]?[0-9]+\s*")
+NUMBER_STARTS = set("0123456789+-. \tiI")
+
+_hashes = {}
+
+
+class Table:
+    # Columns of one CSV, in file order. Arrays are read-only views into the
+    # mapped cache file (or plain arrays for files that are not cached).
+    def __init__(self, columns, numeric):
+        self.columns = columns
+        self._numeric = numeric
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def __contains__(self, name):
+        return name in self.columns
+
+    def is_text(self, name):
+        return self.columns[name].dtype.kind == "U"
+
+    def numeric(self, name):
+        # float64 values of a column; NaN where a text cell is not a number
+        if self.is_text(name):
+            return self._numeric[name]
+        return self.columns[name].astype(np.float64, copy=False)
+
+    def to_frame(self):
+        # The DataFrame pandas.read_csv returns for the file
+        import pandas as pd
+
+        data = {}
+        for name, column in self.columns.items():
+            if column.dtype.kind == "U":
+                values = column.astype(object)
+                values[column == ""] = np.nan
+                data[name] = values
+            else:
+                data[name] = column
+        return pd.DataFrame(data)
+
+
+def to_number(cell):
+    if cell in NA_VALUES:
+        return np.nan
+    # float() also takes "1_000", pandas does not
+    if "_" in cell:
+        raise ValueError(f"not a number: {cell!r}")
+    return float(cell)
+
+
+def parse_column(cells):
+    try:
+        if all(INT_PATTERN.fullmatch(cell) for cell in cells):
+            return np.array([int(cell) for cell in cells], dtype=np.int64), None
+        return np.array([to_number(cell) for cell in cells], dtype=np.float64), None
+    except (ValueError, OverflowError):
+        pass
+
+    # Text; the numbers among it are kept for numeric()
+    text = np.array(["" if cell in NA_VALUES else cell for cell in cells], dtype=str)
+    numbers = np.full(len(cells), np.nan)
+    for i, cell in enumerate(cells):
+        if cell[:1] in NUMBER_STARTS:
+            with contextlib.suppress(ValueError):
+                numbers[i] = to_number(cell)
+    return text, numbers
+
+
+def parse_csv(filepath):
+    with open(filepath, "r", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        rows = [row + [""] * (len(header) - len(row)) for row in reader if row]
+    columns, numeric = {}, {}
+    for name, cells in zip(header, zip(*rows) if rows else [()] * len(header)):
+        columns[name], coerced = parse_column(cells)
+        if coerced is not None:
+            numeric[name] = coerced
+    return Table(columns, numeric)
+
+
+def content_hash(filepath):
+    stat = filepath.stat()
+    key = (os.path.abspath(filepath), stat.st_size, stat.st_mtime_ns)
+    if key not in _hashes:
+        with open(filepath, "rb") as f:
+            _hashes[key] = hashlib.file_digest(f, "sha256").hexdigest()
+    return _hashes[key]
+
+
+def padded(content):
+    return content.ljust(-(-len(content) // ALIGNMENT) * ALIGNMENT, b"\0")
+
+
+def write_entry(entry, table):
+    arrays = [(name, "column", column) for name, column in table.columns.items()]
+    arrays += [(name, "numeric", column) for name, column in table._numeric.items()]
+    layout, chunks, offset = [], [], 0
+    for name, kind, array in arrays:
+        layout.append({"name": name, "kind": kind, "dtype": array.dtype.str, "length": len(array), "offset": offset})
+        chunks.append(padded(array.tobytes()))
+        offset += len(chunks[-1])
+    header = json.dumps({"version": FORMAT_VERSION, "arrays": layout}).encode() + b"\n"
+
+    # Written under a temporary name and renamed, so concurrent readers and
+    # writers (e.g. build_figures.py workers) only ever see complete files
+    entry.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = entry.with_name(f".{entry.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp_file.write_bytes(b"".join([padded(header)] + chunks))
+    os.replace(tmp_file, entry)
+
+
+def read_entry(entry):
+    with open(entry, "rb") as f:
+        header = f.readline()
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    meta = json.loads(header)
+    if meta["version"] != FORMAT_VERSION:
+        raise ValueError(f"{entry} has format {meta['version']}, expected {FORMAT_VERSION}")
+    start = len(padded(header))
+    columns, numeric = {}, {}
+    for item in meta["arrays"]:
+        array = np.frombuffer(buffer, dtype=np.dtype(item["dtype"]), count=item["length"], offset=start + item["offset"])
+        (columns if item["kind"] == "column" else numeric)[item["name"]] = array
+    return Table(columns, numeric)
+
+
+def read_table(filepath):
+    filepath = Path(filepath)
+    if filepath.stat().st_size < MIN_CACHED_BYTES:
+        return parse_csv(filepath)
+    entry = CACHE_DIR / f"{content_hash(filepath)}.cols"
+    try:
+        return read_entry(entry)
+    except (OSError, ValueError):
+        table = parse_csv(filepath)
+        write_entry(entry, table)
+        return table
+
+
+def read_csv(filepath):
+    # Drop-in for pandas.read_csv(filepath) with default arguments
+    return read_table(filepath).to_frame()
@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""
+SQLite store of the results in data/
+
+Loads every agent's scores, stds, fallback codes, overall score and time into
+one database, using generate_data.py's own loaders so the values are exactly
+the ones published in scores.json. Lookups such as "all agents on gsm8k for
+gemma-3-4b-pt" are then one indexed query instead of a pass over data/.
+
+Each agent has an "aggregate" run holding what the site shows. Agents with
+data/runs/<label>/ also have one run per CSV in there. The `results` view
+joins everything into (agent, harness, run, base_model, benchmark, value,
+std, fallback, hours) rows.
+
+    python3 results_store.py ingest
+    python3 results_store.py query --base-model gemma-3-4b-pt --benchmark gsm8k
+
+The store records the size, mtime and hash of each input; open_store()
+re-ingests when any of them changed, so readers never see stale data.
+"""
+
+import argparse
+import contextlib
+import csv
+import os
+import sqlite3
+import sys
+from pathlib import Path
+
+import numpy as np
+
+import generate_data as gd
+
+STORE_FILE = gd.RESULTS_STORE_FILE
+AGGREGATE_RUN = "aggregate"
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE agents (
+    agent_id INTEGER PRIMARY KEY,  -- order of the agents in scores.json
+    key TEXT NOT NULL UNIQUE,
+    harness TEXT NOT NULL,         -- "baseline", "native" or the run name's harness ("opencode", ...)
+    source TEXT NOT NULL           -- input files, relative to data/
+);
+CREATE TABLE base_models (
+    base_model_id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE benchmarks (
+    benchmark_id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    weight REAL NOT NULL
+);
+CREATE TABLE fallback_types (
+    fallback INTEGER PRIMARY KEY,  -- code in ScoreTensor.fallback
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE runs (
+    run_id INTEGER PRIMARY KEY,
+    agent_id INTEGER NOT NULL REFERENCES agents,
+    name TEXT NOT NULL,
+    hours REAL,
+    score REAL,                    -- weighted average over base models and benchmarks
+    UNIQUE (agent_id, name)
+);
+CREATE TABLE scores (
+    run_id INTEGER NOT NULL REFERENCES runs,
+    base_model_id INTEGER NOT NULL REFERENCES base_models,
+    benchmark_id INTEGER NOT NULL REFERENCES benchmarks,
+    value REAL,                    -- percent; NULL for a missing cell of a single run
+    std REAL,
+    fallback INTEGER NOT NULL REFERENCES fallback_types,
+    PRIMARY KEY (run_id, base_model_id, benchmark_id)
+) WITHOUT ROWID;
+CREATE INDEX scores_by_cell ON scores (base_model_id, benchmark_id);
+
+-- aggregatedScores and timeData entries, in the order scores.json lists them
+CREATE TABLE agent_scores (
+    agent_id INTEGER PRIMARY KEY REFERENCES agents,
+    position INTEGER NOT NULL,
+    avg REAL NOT NULL,
+    std REAL NOT NULL,
+    n INTEGER NOT NULL
+);
+CREATE TABLE agent_times (
+    agent_id INTEGER PRIMARY KEY REFERENCES agents,
+    position INTEGER NOT NULL,
+    hours REAL NOT NULL,
+    time TEXT NOT NULL,
+    std_hours REAL,
+    std_time TEXT,
+    n INTEGER NOT NULL
+);
+
+CREATE TABLE inputs (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    sha256 TEXT NOT NULL
+);
+
+CREATE VIEW results AS
+SELECT a.key AS agent, a.harness, r.name AS run, m.name AS base_model, b.name AS benchmark,
+       s.value, s.std, f.name AS fallback, r.hours
+FROM scores s
+JOIN runs r USING (run_id)
+JOIN agents a USING (agent_id)
+JOIN base_models m USING (base_model_id)
+JOIN benchmarks b USING (benchmark_id)
+JOIN fallback_types f USING (fallback);
+"""
+
+# Columns of the results view select_results() can filter on
+FILTERS = ("agent", "harness", "run", "base_model", "benchmark")
+
+
+def connect(store_file=STORE_FILE):
+    conn = sqlite3.connect(store_file)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON")
+    return conn
+
+
+def harness_of(agent_key, files):
+    if agent_key in gd.BASELINE_KEYS:
+        return "baseline"
+    label = files.get("final", files.get("aggregated"))
+    if label is None:
+        return "native"
+    return gd.parse_run_name(label.removesuffix(".csv").split("_", 1)[1])[0]
+
+
+def input_files(registry, scores, stds):
+    # Everything the build reads, plus generate_data.py itself for the agent key rules
+    files = {gd.DATA_DIR / "factors.json", Path(gd.__file__).resolve()}
+    for _, paths in list(scores.values()) + list(stds.values()):
+        files.update(paths)
+    for name in ["single_metrics_aggregated.csv", "time_aggregated.csv", "aggregated_time_overview.csv"]:
+        if name in registry["files"]:
+            files.add(gd.DATA_DIR / name)
+    return sorted(files)
+
+
+def read_run_times(run_dir):
+    time_file = run_dir / gd.RUN_TIME_FILE
+    if not time_file.exists():
+        return {}
+    with open(time_file, 'r') as f:
+        return {row["run"]: gd.parse_time_to_hours(row["time"]) for row in csv.DictReader(f)}
+
+
+def single_runs(files, weights):
+    # (name, hours, score, values, fallback) for each CSV of a data/runs/<label>/ agent
+    run_files = [f for f in files if f.suffix == ".csv" and f.name != gd.RUN_TIME_FILE and f.parent != gd.DATA_DIR]
+    times = read_run_times(run_files[0].parent) if run_files else {}
+    for filepath in run_files:
+        values, codes = gd.read_cells(filepath)
+        values = gd.to_percentage(values)
+        score = None if codes.any() else float(np.round((values @ weights).mean(), 2))
+        yield filepath.stem, times.get(filepath.stem), score, values, codes
+
+
+def ingest(store_file=STORE_FILE):
+    registry = gd.load_registry()
+    scores = gd.score_sources(registry)
+    stds = gd.std_sources(registry)
+    gd.ingest_runs.cache_clear()  # cached by file name, as in generate_scores_json
+    tensor, _ = gd.build_tensor(scores, stds)
+
+    aggregated_file = gd.DATA_DIR / "single_metrics_aggregated.csv"
+    aggregated_scores = gd.load_aggregated_scores(aggregated_file, registry["names"], scores) if aggregated_file.exists() else {}
+    gd.add_run_aggregated_scores(aggregated_scores, scores)
+    time_data = gd.load_time_data(registry["names"], scores)
+    gd.add_run_time_data(time_data, scores)
+    weights = gd.read_json(gd.DATA_DIR / "factors.json")
+    w = np.array([weights[bm] for bm in gd.BENCHMARKS])
+    aggregates = gd.compute_aggregates(tensor, weights)
+
+    # Built next to the store and renamed over it, so readers never see a partial database
+    store_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = store_file.with_name(f".{store_file.name}.{os.getpid()}.tmp")
+    tmp_file.unlink(missing_ok=True)
+    try:
+        with contextlib.closing(connect(tmp_file)) as conn, conn:
+            conn.executescript(SCHEMA)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            conn.executemany("INSERT INTO base_models VALUES (?, ?)", enumerate(gd.BASE_MODELS))
+            conn.executemany("INSERT INTO benchmarks VALUES (?, ?, ?)",
+                             [(b, bm, weights[bm]) for b, bm in enumerate(gd.BENCHMARKS)])
+            conn.executemany("INSERT INTO fallback_types VALUES (?, ?)",
+                             [(code, name or "none") for code, name in enumerate(gd.FALLBACK_TYPES)])
+
+            cells = [(m, b) for m in range(len(gd.BASE_MODELS)) for b in range(len(gd.BENCHMARKS))]
+            run_id = 0
+            for a, agent_key in enumerate(tensor.agents):
+                files = registry["agents"].get(agent_key, {})
+                source = ", ".join(Path(f).relative_to(gd.DATA_DIR).as_posix() for f in scores[agent_key][1])
+                conn.execute("INSERT INTO agents VALUES (?, ?, ?, ?)", (a, agent_key, harness_of(agent_key, files), source))
+
+                hours = time_data.get(agent_key, {}).get("hours")
+                conn.execute("INSERT INTO runs VALUES (?, ?, ?, ?, ?)",
+                             (run_id, a, AGGREGATE_RUN, hours, float(np.round(aggregates["overall"][a], 2))))
+                std = tensor.std[a] if tensor.has_std[a] else np.full(tensor.std[a].shape, None)
+                conn.executemany("INSERT INTO scores VALUES (?, ?, ?, ?, ?, ?)", [
+                    (run_id, m, b, float(tensor.values[a, m, b]), None if std[m, b] is None else float(std[m, b]),
+                     int(tensor.fallback[a, m, b]))
+                    for m, b in cells
+                ])
+                run_id += 1
+
+                if "runs" not in files:
+                    continue
+                for name, run_hours, score, values, codes in single_runs(scores[agent_key][1], w):
+                    conn.execute("INSERT INTO runs VALUES (?, ?, ?, ?, ?)", (run_id, a, name, run_hours, score))
+                    conn.executemany("INSERT INTO scores VALUES (?, ?, ?, ?, NULL, ?)", [
+                        (run_id, m, b, None if codes[m, b] else float(values[m, b]), int(codes[m, b]))
+                        for m, b in cells
+                    ])
+                    run_id += 1
+
+            agent_ids = {agent_key: a for a, agent_key in enumerate(tensor.agents)}
+            conn.executemany("INSERT INTO agent_scores VALUES (?, ?, ?, ?, ?)", [
+                (agent_ids[agent_key], position, entry["avg"], entry["std"], entry["n"])
+                for position, (agent_key, entry) in enumerate(aggregated_scores.items())
+            ])
+            conn.executemany("INSERT INTO agent_times VALUES (?, ?, ?, ?, ?, ?, ?)", [
+                (agent_ids[agent_key], position, entry["hours"], entry["time"], entry["stdHours"], entry["stdTime"],
+                 entry["n"])
+                for position, (agent_key, entry) in enumerate(time_data.items())
+            ])
+
+            conn.executemany("INSERT INTO inputs VALUES (?, ?, ?, ?)", [
+                (str(path), digest["size"], digest["mtime_ns"], digest["sha256"])
+                for path in input_files(registry, scores, stds)
+                for digest in [gd.file_digest(path)]
+            ])
+        os.replace(tmp_file, store_file)
+    except BaseException:
+        tmp_file.unlink(missing_ok=True)
+        raise
+    return len(tensor.agents), run_id
+
+
+def is_current(store_file=STORE_FILE):
+    if not store_file.exists():
+        return False
+    with contextlib.closing(connect(store_file)) as conn:
+        if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            return False
+        recorded = {row["path"]: dict(row) for row in conn.execute("SELECT * FROM inputs")}
+    registry = gd.load_registry()
+    current = input_files(registry, gd.score_sources(registry), gd.std_sources(registry))
+    if set(map(str, current)) != set(recorded):
+        return False
+    for path in current:
+        previous = recorded[str(path)]
+        if gd.file_digest(path, previous)["sha256"] != previous["sha256"]:
+            return False
+    return True
+
+
+def open_store(store_file=STORE_FILE):
+    # Connection to an up-to-date store, re-ingesting data/ first if needed
+    if not is_current(store_file):
+        ingest(store_file)
+    return connect(store_file)
+
+
+def select_results(conn, **filters):
+    # Rows of the results view; each keyword (agent, harness, run, base_model,
+    # benchmark) restricts that column, e.g. base_model="gemma-3-4b-pt"
+    unknown = set(filters) - set(FILTERS)
+    if unknown:
+        raise ValueError(f"unknown filter(s): {', '.join(sorted(unknown))}")
+    given = {column: value for column, value in filters.items() if value is not None}
+    where = " AND ".join(f"{column} = ?" for column in given) or "1"
+    return conn.execute(f"SELECT * FROM results WHERE {where} ORDER BY agent, run, base_model, benchmark",
+                        list(given.values())).fetchall()
+
+
+def agent_matrices(conn, base_models, benchmarks):
+    # {agent: (values, fallback, std or None)} of the aggregate runs, as
+    # (base_model, benchmark) arrays in the given order
+    rows = conn.execute(
+        "SELECT a.key, m.name AS base_model, b.name AS benchmark, s.value, s.std, s.fallback "
+        "FROM scores s JOIN runs r USING (run_id) JOIN agents a USING (agent_id) "
+        "JOIN base_models m USING (base_model_id) JOIN benchmarks b USING (benchmark_id) "
+        "WHERE r.name = ? ORDER BY a.agent_id", (AGGREGATE_RUN,))
+    models = {name: m for m, name in enumerate(base_models)}
+    columns = {name: b for b, name in enumerate(benchmarks)}
+    shape = (len(base_models), len(benchmarks))
+    matrices = {}
+    for key, model, benchmark, value, std, fallback in rows:
+        if key not in matrices:
+            matrices[key] = (np.full(shape, np.nan), np.zeros(shape, dtype=np.uint8), np.full(shape, np.nan))
+        if model in models and benchmark in columns:
+            cell = models[model], columns[benchmark]
+            matrices[key][0][cell] = value
+            matrices[key][1][cell] = fallback
+            matrices[key][2][cell] = np.nan if std is None else std
+    return {key: (values, fallback, None if np.isnan(std).all() else std)
+            for key, (values, fallback, std) in matrices.items()}
+
+
+def agent_scores(conn):
+    rows = conn.execute("SELECT a.key, s.avg, s.std, s.n FROM agent_scores s JOIN agents a USING (agent_id) "
+                        "ORDER BY s.position")
+    return {key: {"avg": avg, "std": std, "n": n} for key, avg, std, n in rows}
+
+
+def agent_times(conn):
+    rows = conn.execute("SELECT a.key, t.hours, t.time, t.std_hours, t.std_time, t.n FROM agent_times t "
+                        "JOIN agents a USING (agent_id) ORDER BY t.position")
+    return {key: {"hours": hours, "time": time, "stdHours": std_hours, "stdTime": std_time, "n": n}
+            for key, hours, time, std_hours, std_time, n in rows}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load data/ into a SQLite store and query it")
+    parser.add_argument("--store", type=Path, default=STORE_FILE, help=f"database file (default: {STORE_FILE})")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("ingest", help="(re)build the store from data/")
+    query = commands.add_parser("query", help="print matching rows of the results view")
+    for column in FILTERS:
+        query.add_argument(f"--{column.replace('_', '-')}", dest=column)
+    query.set_defaults(run=AGGREGATE_RUN)
+    args = parser.parse_args()
+
+    os.chdir(Path(__file__).resolve().parent)
+    if args.command == "ingest":
+        agents, runs = ingest(args.store)
+        print(f"Wrote {args.store}: {agents} agents, {runs} runs")
+        return 0
+
+    with contextlib.closing(open_store(args.store)) as conn:
+        rows = select_results(conn, **{column: getattr(args, column) for column in FILTERS})
+    print(f"{'agent':32s}{'run':>12s}{'base model':>18s}{'benchmark':>18s}{'value':>8s}{'std':>8s}  fallback")
+    for row in rows:
+        value = "" if row["value"] is None else f"{row['value']:.2f}"
+        std = "" if row["std"] is None else f"{row['std']:.2f}"
+        print(f"{row['agent']:32s}{row['run']:>12s}{row['base_model']:>18s}{row['benchmark']:>18s}{value:>8s}{std:>8s}"
+              f"  {row['fallback']}")
+    print(f"{len(rows)} row(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())